@@ -1,25 +1,86 @@
 from abc import ABC, abstractmethod, abstractproperty
-from matplotlib import pyplot as plt
+from array import array
+import numpy as np
+import time
 from numpy import inf
-from random import choice, random
+
+from .callbacks import ConsolePrinter
+from .checkpoint import load_arrays, normalize, save_arrays
+from .environment.integrators import integrators
+from .misc import RandomStream, pyplot
+from .trajectory import create_trajectory
 
 
 class Algorithm(ABC):
     """Algorithm - abstraction for reinforced learning algorithms."""
+    # names of attributes keeping learned tables (arrays or lists of arrays)
+    tables = ()
+    hyperparameters = ('lambd', 'epsilon', 'gamma', 'alpha', 'beta',
+                       'trace_cutoff')
 
     def __init__(self, environment, lambd: float, epsilon: float, gamma: float,
-                 alpha: float, *args, **kwargs):
+                 alpha: float, *args, trace_cutoff: float = None, seed=None,
+                 **kwargs):
         self.environment = environment
         self.actions = list(range(len(self.environment.actions)))
         self.lambd = lambd
         self.epsilon = epsilon
         self.gamma = gamma
         self.alpha = alpha
+        self.trace_cutoff = trace_cutoff
+        self.random = RandomStream(len(self.actions), seed)
         self.steps_per_episode = []
 
     @abstractmethod
-    def get_greedy_actions(self, environment_state) -> list:
-        pass
+    def action_values(self, environment_state) -> np.ndarray:
+        """Returns values of all of actions in given environment state. Array
+            may be a view of learned table or buffer reused by next calls, so
+            it should not be modified nor kept."""
+
+    def batch_action_values(self, environment_states) -> np.ndarray:
+        """Returns (N, n_actions) values of actions in each of N environment
+            states."""
+        # rows are copied, because action_values may reuse its buffer
+        return np.array([
+            self.action_values(environment_state).copy()
+            for environment_state in environment_states
+        ])
+
+    def greedy_actions(self, environment_states,
+                       random_ties=True) -> np.ndarray:
+        """Returns greedy action index for each of N environment states at
+            once. Ties are broken uniformly at random or, if random_ties is
+            False, towards lower action index."""
+        values = self.batch_action_values(environment_states)
+        if not random_ties:
+            return values.argmax(1)
+        # each of best actions gets random priority, others get -1
+        priorities = self.random.generator.random(values.shape)
+        priorities[values < values.max(1, keepdims=True)] = -1.0
+        return priorities.argmax(1)
+
+    def get_greedy_actions(self, environment_state=None) -> np.ndarray:
+        if environment_state is None:
+            environment_state = self.environment.state
+        values = self.action_values(environment_state)
+        return np.where(values == values.max())[0]
+
+    def greedy_action(self, environment_state=None) -> int:
+        """Returns index of action of maximal value in given (or current)
+            environment state, ties are broken uniformly at random."""
+        if environment_state is None:
+            environment_state = self.environment.state
+        values = self.action_values(environment_state).tolist()
+        best = max(values)
+        if values.count(best) == 1:
+            return values.index(best)
+        return self.random.choice(
+            [a for a, value in enumerate(values) if value == best]
+        )
+
+    def is_greedy(self, environment_state, action_index: int) -> bool:
+        values = self.action_values(environment_state)
+        return values[action_index] >= values.max()
 
     @abstractmethod
     def run_learning_episode(self, render=False):
@@ -29,32 +90,167 @@ class Algorithm(ABC):
     def episodes(self):
         return len(self.steps_per_episode)
 
+    @classmethod
+    def label(cls, lambd: float) -> str:
+        """Returns name of algorithm learning with given lambda, without
+            creating its instance."""
+        if lambd > 0.0:
+            return cls.__name__ + '(lambda)'
+        return cls.__name__ + '(0)'
+
     @property
     def name(self) -> str:
-        if self.lambd > 0.0:
-            return self.__class__.__name__ + '(lambda)'
-        return self.__class__.__name__ + '(0)'
+        return self.label(self.lambd)
 
     def get_action(self, epsilon_greedy=True) -> int:
-        if epsilon_greedy and random() < self.epsilon:
-            return choice(self.actions)
+        if epsilon_greedy and self.random.uniform() < self.epsilon:
+            return self.random.action()
         else:
-            return choice(self.get_greedy_actions())
+            return self.greedy_action()
 
     def learn(self, n_episodes=1, stop_when_learned=False, spe_lte=0,
-              spe_gte=inf, wsize=1, print_status=True, render=False):
-        for i in range(n_episodes):
-            self.environment.clear()
-            if print_status:
-                print(f"environment: {self.environment.__class__.__name__}\n" +
-                      f"algorithm:   {self.name}\n" +
-                      f"episode:     {self.episodes + 1}\n")
-            self.run_learning_episode(render=render)
-            self.steps_per_episode.append(len(self.environment.steps))
-            if stop_when_learned and self.is_learned(spe_lte, spe_gte, wsize):
-                break
+              spe_gte=inf, wsize=1, print_status=True, render=False,
+              checkpoint_path=None, checkpoint_every=None,
+              checkpoint_interval=None, profiler=None, callbacks=()):
+        """Learns for n_episodes episodes. If checkpoint_path is given,
+            algorithm is saved there after every checkpoint_every episodes
+            and after episode ending at least checkpoint_interval seconds
+            after last checkpoint. If profiler (profiling.Profiler) is
+            given, phases of each episode are measured with it. Events of
+            learning are passed to callbacks (callbacks.Callback), status is
+            printed with ConsolePrinter if print_status is True."""
+        callbacks = list(callbacks)
+        if print_status:
+            callbacks.append(ConsolePrinter())
+        for callback in callbacks:
+            callback.on_learn_start(self, n_episodes)
+        last_checkpoint = time.monotonic()
+        try:
+            for i in range(n_episodes):
+                self.environment.clear()
+                for callback in callbacks:
+                    callback.on_episode_start(self)
+                start = time.perf_counter()
+                report = None
+                if profiler is None:
+                    self.run_learning_episode(render=render)
+                else:
+                    profiler.start_episode(self)
+                    try:
+                        self.run_learning_episode(render=render)
+                    finally:
+                        report = profiler.end_episode(self)
+                wall_time = time.perf_counter() - start
+                self.steps_per_episode.append(self.environment.steps)
+                if callbacks:
+                    metrics = {
+                        'episode': self.episodes,
+                        'steps': self.environment.steps,
+                        'wall_time': wall_time,
+                        'steps_per_second': self.environment.steps / wall_time
+                        if wall_time > 0.0 else 0.0,
+                        'return': self.environment.episode_return,
+                        'profile': report
+                    }
+                    for callback in callbacks:
+                        callback.on_episode_end(self, metrics)
+                if checkpoint_path is not None and (
+                    checkpoint_every and self.episodes % checkpoint_every == 0
+                    or checkpoint_interval is not None and
+                    time.monotonic() - last_checkpoint >= checkpoint_interval
+                ):
+                    self.save(checkpoint_path)
+                    last_checkpoint = time.monotonic()
+                    for callback in callbacks:
+                        callback.on_checkpoint(self, checkpoint_path)
+                if stop_when_learned and \
+                        self.is_learned(spe_lte, spe_gte, wsize):
+                    break
+        finally:
+            for callback in callbacks:
+                callback.on_learn_end(self)
         return self.steps_per_episode, self.environment
 
+    def environment_config(self) -> dict:
+        environment = self.environment
+        config = {
+            'environment': environment.name,
+            'max_steps': environment.max_steps,
+            'state_variables_ranges': environment.state_variables_ranges,
+            'approximator': None
+        }
+        approximator = environment.approximator
+        if approximator is not None:
+            config['approximator'] = {
+                'class': approximator.__class__.__name__,
+                'state_variables_ranges': approximator.state_variables_ranges
+            }
+            for name in ('n_layers', 'state_shape'):
+                if hasattr(approximator, name):
+                    config['approximator'][name] = \
+                        list(np.atleast_1d(getattr(approximator, name)))
+        return config
+
+    def save(self, path: str):
+        """Saves learned tables, steps per episode, hyperparameters, state of
+            random stream and environment configuration into .npz file."""
+        arrays = {'steps_per_episode': np.array(self.steps_per_episode,
+                                                dtype=np.int64)}
+        layers = {}
+        for name in self.tables:
+            table = getattr(self, name)
+            if isinstance(table, list):
+                layers[name] = len(table)
+                for l, layer in enumerate(table):
+                    arrays[f'{name}_{l}'] = layer
+            else:
+                arrays[name] = table
+        save_arrays(path, arrays, {
+            'algorithm': self.__class__.__name__,
+            'hyperparameters': {
+                name: getattr(self, name) for name in self.hyperparameters
+                if hasattr(self, name)
+            },
+            'layers': layers,
+            'random': self.random.state,
+            'environment': self.environment_config()
+        })
+
+    def load(self, path: str, mmap_mode: str = None):
+        """Loads state of algorithm saved with save. Saved algorithm must be
+            of the same class and learn in the same kind of environment.
+            Tables can be memory mapped instead of being read, with mmap_mode
+            'c' (copy-on-write, for further learning), 'r' or 'r+' (which
+            writes learning into file)."""
+        arrays, metadata = load_arrays(path, mmap_mode)
+        if metadata['algorithm'] != self.__class__.__name__:
+            raise ValueError(f"cannot load {metadata['algorithm']} into" +
+                             f" {self.__class__.__name__}")
+        saved = metadata['environment']
+        current = normalize(self.environment_config())
+        for key in ('environment', 'approximator'):
+            if saved[key] != current[key]:
+                raise ValueError(f"saved {key} {saved[key]} differs from" +
+                                 f" current {key} {current[key]}")
+        for name in self.tables:
+            if name in metadata['layers']:
+                table = [arrays[f'{name}_{l}']
+                         for l in range(metadata['layers'][name])]
+                shapes = [layer.shape for layer in table]
+                expected = [layer.shape for layer in getattr(self, name)]
+            else:
+                table = arrays[name]
+                shapes, expected = table.shape, getattr(self, name).shape
+            if shapes != expected:
+                raise ValueError(f"saved {name} table of shape {shapes}" +
+                                 f" differs from expected {expected}")
+            setattr(self, name, table)
+        for name, value in metadata['hyperparameters'].items():
+            setattr(self, name, value)
+        self.steps_per_episode = arrays['steps_per_episode'].tolist()
+        self.random.state = metadata['random']
+        return self
+
     def is_learned(self, steps_per_episode_lte=0, steps_per_episode_gte=inf,
                    window_size=1):
         if len(self.steps_per_episode) < window_size:
@@ -82,6 +278,12 @@ class Approximator(ABC):
     def approximate_state(self, observation: tuple):
         pass
 
+    def approximate_states(self, observations):
+        """Approximates each of (N, n_state_variables) observations."""
+        return np.array([
+            self.approximate_state(observation) for observation in observations
+        ])
+
     @property
     def n_state_variables(self):
         return self._n_state_variables
@@ -109,15 +311,36 @@ class Approximator(ABC):
 
 class Model(ABC):
     """Model - abstraction of object (or set of objects) being a base of
-        environment for training AI algorithms."""
-
-    def __init__(self, timestep=0.01, *args, **kwargs):
+        environment for training AI algorithms. Step of model is computed
+        with its native integrator (written out in step) by default. Other
+        integrators (see environment.integrators) can be used by models
+        which keep their state in variables array and specify derivatives
+        of these variables."""
+    __slots__ = ('timestep', 'viewer', 'integrator')
+    native_integrator = 'euler'
+    # (position, speed) indices pairs of variables
+    coordinates = ()
+    # method derivatives(variables) -> tuple, returning time derivatives of
+    # given variables under current control, defined by models which can be
+    # integrated with other integrators
+    derivatives = None
+
+    def __init__(self, timestep=0.01, *args, integrator=None, **kwargs):
         self.timestep = timestep
         self.viewer = None
+        integrator = integrator or self.native_integrator
+        if integrator not in integrators:
+            raise ValueError(f"unknown integrator {integrator}, possible" +
+                             f" integrators: {list(integrators)}")
+        if integrator != self.native_integrator and \
+                self.derivatives is None:
+            raise ValueError(f"{self.__class__.__name__} can be integrated" +
+                             f" only with {self.native_integrator}")
+        self.integrator = integrator
 
     def close(self):
         if self.viewer is not None:
-            plt.close(self.viewer)
+            pyplot().close(self.viewer)
             self.viewer = None
 
     @abstractproperty
@@ -136,42 +359,72 @@ class Model(ABC):
     def step(self, control: float or None) -> tuple:
         pass
 
+    def constrain(self, variables):
+        """Applies constraints (e.g. bounds) to variables in place."""
+
+    def integrate(self):
+        """Advances variables by one timestep with model's integrator."""
+        self.variables[:] = array('d', integrators[self.integrator](
+            self.derivatives, tuple(self.variables), self.timestep,
+            self.coordinates
+        ))
+        self.constrain(self.variables)
+
 
 class Environment(ABC):
-    """Environment - abstraction of ready-to-use learning environment"""
+    """Environment - abstraction of ready-to-use learning environment. With
+        action_repeat k, each action advances model by k timesteps (or until
+        absorbing state is reached) and rewards of these timesteps are
+        summed, while steps (and max_steps) count actions."""
     model = None
     state_variables_ranges = []
     max_steps = 100000
 
     def __init__(self, max_steps=None, state_variables_ranges=None,
-                 *args, **kwargs):
+                 *args, recording='count', recording_size=None,
+                 action_repeat=1, **kwargs):
+        if action_repeat < 1:
+            raise ValueError("action_repeat must be positive")
+        self.action_repeat = action_repeat
         self.approximator = None
         self.model = self.model(*args, **kwargs)
         self.max_steps = max_steps or self.max_steps
         self.state_variables_ranges = state_variables_ranges or \
             self.state_variables_ranges
+        self.trajectory = create_trajectory(
+            recording, len(self.model.observation), recording_size
+        )
         self.clear()
 
     @abstractproperty
     def actions(self) -> list:
         pass
 
-    @abstractproperty
-    def reward(self) -> float:
-        pass
+    @abstractmethod
+    def get_reward(self, absorbing: bool) -> float:
+        """Returns reward of current state, which is absorbing or not."""
 
     @abstractmethod
     def is_state_absorbing(self) -> bool:
         pass
 
+    @property
+    def reward(self) -> float:
+        return self.get_reward(self.is_state_absorbing())
+
     @property
     def done(self) -> bool:
-        return self.is_state_absorbing() or len(self.steps) >= self.max_steps
+        return self.is_state_absorbing() or \
+            self.trajectory.n_steps >= self.max_steps
 
     @property
     def name(self) -> str:
         return self.__class__.__name__
 
+    @property
+    def steps(self) -> int:
+        return self.trajectory.n_steps
+
     @property
     def states(self):
         if self.approximator is not None:
@@ -192,17 +445,42 @@ class Environment(ABC):
     def clear(self):
         self.model.reset()
         self.state = self.get_state()
-        self.steps = []
+        self.trajectory.clear()
+        self.episode_return = 0.0
 
     def close(self):
         self.model.close()
 
     def do_action(self, action_index):
-        action = self.actions[action_index]
-        self.model.step(action)
+        return self.step(action_index)[0]
+
+    def step(self, action_index) -> tuple:
+        """Does action and returns (state, reward, done) of transition,
+            each computed once."""
+        if self.action_repeat == 1:
+            self.model.step(self.actions[action_index])
+            absorbing = self.is_state_absorbing()
+            reward = self.get_reward(absorbing)
+        else:
+            absorbing, reward = self.repeat_action(action_index)
+        self.trajectory.record(self.model.observation)
         self.state = self.get_state()
-        self.steps.append(self.state)
-        return self.state
+        self.episode_return += reward
+        return self.state, reward, \
+            absorbing or self.trajectory.n_steps >= self.max_steps
+
+    def repeat_action(self, action_index) -> tuple:
+        """Advances model by action_repeat timesteps with action, stopping
+            at absorbing state. Returns (absorbing, sum of rewards)."""
+        control = self.actions[action_index]
+        reward = 0.0
+        for i in range(self.action_repeat):
+            self.model.step(control)
+            absorbing = self.is_state_absorbing()
+            reward += self.get_reward(absorbing)
+            if absorbing:
+                break
+        return absorbing, reward
 
     def get_state(self):
         if self.approximator is not None:
@@ -1,3 +1,5 @@
+import numpy as np
+
 from ..abstract import Algorithm
 from ..approximator import (
     TableApproximator,
@@ -25,6 +27,29 @@ class ClassicAlgorithm(Algorithm):
 
 class CMACAlgorithm(Algorithm):
 
+    def __init__(self, environment, lambd: float, epsilon: float, gamma: float,
+                 alpha: float, *args, **kwargs):
+        super().__init__(environment, lambd, epsilon, gamma, alpha,
+                         *args, **kwargs)
+        self._values = np.empty(len(self.actions))
+
+    def sum_layers(self, tables: list, environment_state) -> np.ndarray:
+        """Sums rows of given layers tables for given states of layers into
+            reused buffer."""
+        values = self._values
+        values[:] = tables[0][environment_state[0]]
+        for table, s in zip(tables[1:], environment_state[1:]):
+            values += table[s]
+        return values
+
+    def sum_batch_layers(self, tables: list, environment_states):
+        """Sums rows of given layers tables for (N, n_layers) states."""
+        environment_states = np.asarray(environment_states, dtype=np.intp)
+        values = tables[0][environment_states[:, 0]]
+        for l in range(1, len(tables)):
+            values += tables[l][environment_states[:, l]]
+        return values
+
     @property
     def environment(self):
         return self._environment
@@ -1,9 +1,11 @@
 import numpy as np
 
 from .abstract import ClassicAlgorithm
+from ..traces import create_eligibility_traces
 
 
 class AHC(ClassicAlgorithm):
+    tables = ('V', 'mi')
 
     def __init__(self, environment, lambd=0.0, epsilon=0.005, gamma=0.95,
                  alpha=0.1, beta=0.01, *args, **kwargs):
@@ -13,14 +15,16 @@ class AHC(ClassicAlgorithm):
         self.V = np.ones(len(self.environment.states))
         self.mi = np.zeros((self.V.size, len(self.actions)))
 
-    def get_greedy_actions(self, environment_state=None):
-        s = environment_state or self.environment.state
-        return np.where(self.mi[s, :] == self.mi[s, :].max())[0]
+    def action_values(self, environment_state):
+        return self.mi[environment_state]
+
+    def batch_action_values(self, environment_states):
+        return self.mi[np.asarray(environment_states, dtype=np.intp)]
 
     def run_learning_episode(self, render=False):
         if self.lambd > 0.0:
-            e_s = np.zeros(self.V.shape)
-            e_sa = np.zeros(self.mi.shape)
+            e_s = create_eligibility_traces(self.V.shape, self.trace_cutoff)
+            e_sa = create_eligibility_traces(self.mi.shape, self.trace_cutoff)
 
         while True:
             if render:
@@ -28,27 +32,26 @@ class AHC(ClassicAlgorithm):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = r + self.gamma * self.V[s_] - self.V[s]
             if self.lambd > 0.0:
-                e_s[s] += 1
-                e_sa[s, a] += 1
-                self.V += self.alpha * delta * e_s
-                self.mi += self.beta * delta * e_sa
-                e_s *= self.gamma * self.lambd
-                e_sa *= self.gamma * self.lambd
+                e_s.visit(s)
+                e_sa.visit((s, a))
+                e_s.update(self.V, self.alpha * delta)
+                e_sa.update(self.mi, self.beta * delta)
+                e_s.decay(self.gamma * self.lambd)
+                e_sa.decay(self.gamma * self.lambd)
             else:
                 self.V[s] += self.alpha * delta
                 self.mi[s, a] += self.beta * delta
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
 
 
 class Q(ClassicAlgorithm):
+    tables = ('Q',)
 
     def __init__(self, environment, lambd=0.0, epsilon=0.005, gamma=0.95,
                  alpha=0.1, *args, **kwargs):
@@ -56,30 +59,30 @@ class Q(ClassicAlgorithm):
                          *args, **kwargs)
         self.Q = np.zeros((len(self.environment.states), len(self.actions)))
 
-    def get_greedy_actions(self, environment_state=None):
-        s = environment_state or self.environment.state
-        return np.where(self.Q[s, :] == self.Q[s, :].max())[0]
+    def action_values(self, environment_state):
+        return self.Q[environment_state]
+
+    def batch_action_values(self, environment_states):
+        return self.Q[np.asarray(environment_states, dtype=np.intp)]
 
     def run_learning_episode(self, render=False):
-        e = np.zeros(self.Q.shape)
+        e = create_eligibility_traces(self.Q.shape, self.trace_cutoff)
         while True:
             if render:
                 self.environment.render()
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = r + self.gamma * self.Q[s_, :].max() - self.Q[s, a]
             if self.lambd > 0.0:
-                e[s, a] += 1
-                self.Q += self.alpha * delta * e
-                e *= self.gamma * self.lambd
+                e.visit((s, a))
+                e.update(self.Q, self.alpha * delta)
+                e.decay(self.gamma * self.lambd)
             else:
                 self.Q[s, a] += self.alpha * delta
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
 
@@ -94,26 +97,24 @@ class SARSA(Q):
         self.Q = np.zeros((len(self.environment.states), len(self.actions)))
 
     def run_learning_episode(self, render=False):
-        e = np.zeros(self.Q.shape)
+        e = create_eligibility_traces(self.Q.shape, self.trace_cutoff)
         s = self.environment.state
         a = self.get_action(epsilon_greedy=False)
         while True:
             if render:
                 self.environment.render()
 
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             a_ = self.get_action(epsilon_greedy=False)
             delta = r + self.gamma * self.Q[s_, a_] - self.Q[s, a]
             if self.lambd > 0.0:
-                e[s, a] += 1
-                self.Q += self.alpha * delta * e
-                e *= self.gamma * self.lambd
+                e.visit((s, a))
+                e.update(self.Q, self.alpha * delta)
+                e.decay(self.gamma * self.lambd)
             else:
                 self.Q[s, a] += self.alpha * delta
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
             s = s_
@@ -131,7 +132,7 @@ class R(Q):
         self.Q = np.zeros((len(self.environment.states), len(self.actions)))
 
     def run_learning_episode(self, render=False):
-        e = np.zeros(self.Q.shape)
+        e = create_eligibility_traces(self.Q.shape, self.trace_cutoff)
         rho = 0.0
         while True:
             if render:
@@ -139,19 +140,17 @@ class R(Q):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = r - rho + self.Q[s_, :].max() - self.Q[s, a]
             if self.lambd > 0.0:
-                e[s, a] += 1
-                self.Q += self.alpha * delta * e
-                e *= self.lambd
+                e.visit((s, a))
+                e.update(self.Q, self.alpha * delta)
+                e.decay(self.lambd)
             else:
                 self.Q[s, a] += self.alpha * delta
-            if a in self.get_greedy_actions(s):
+            if self.is_greedy(s, a):
                 rho += self.beta \
                     * (r - rho + self.Q[s_, :].max() - self.Q[s, :].max())
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
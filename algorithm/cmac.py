@@ -4,6 +4,7 @@ from .abstract import CMACAlgorithm
 
 
 class CMACAHC(CMACAlgorithm):
+    tables = ('V', 'mi')
 
     def __init__(self, environment, lambd=0.0, epsilon=0.005, gamma=0.95,
                  alpha=0.1, beta=0.01, *args, **kwargs):
@@ -16,10 +17,11 @@ class CMACAHC(CMACAlgorithm):
             self.V.append(np.ones(len(states)))
             self.mi.append(np.zeros((self.V[layer].size, len(self.actions))))
 
-    def get_greedy_actions(self, environment_state=None):
-        s = environment_state or self.environment.state
-        mi = np.array([self.mi[l][s[l], :] for l in range(self.n_layers)]).sum(0)
-        return np.where(mi == mi.max())[0]
+    def action_values(self, environment_state):
+        return self.sum_layers(self.mi, environment_state)
+
+    def batch_action_values(self, environment_states):
+        return self.sum_batch_layers(self.mi, environment_states)
 
     def run_learning_episode(self, render=False):
         if self.lambd > 0.0:
@@ -32,9 +34,7 @@ class CMACAHC(CMACAlgorithm):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = [
                 r + self.gamma * self.V[l][s_[l]] - self.V[l][s[l]]
                 for l in range(self.n_layers)
@@ -50,12 +50,13 @@ class CMACAHC(CMACAlgorithm):
                     self.V[l][s[l]] += self.alpha / self.n_layers * delta[l]
                     self.mi[l][s[l], a] += self.beta * delta[l]
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
 
 
 class CMACQ(CMACAlgorithm):
+    tables = ('q',)
 
     def __init__(self, environment, lambd=0.0, epsilon=0.005, gamma=0.95,
                  alpha=0.1, *args, **kwargs):
@@ -67,10 +68,11 @@ class CMACQ(CMACAlgorithm):
             for states in self.environment.states
         ]
 
-    def get_greedy_actions(self, environment_state=None):
-        s = environment_state or self.environment.state
-        Q = np.array([self.q[t][s[t], :] for t in range(self.n_layers)]).sum(0)
-        return np.where(Q == Q.max())[0]
+    def action_values(self, environment_state):
+        return self.sum_layers(self.q, environment_state)
+
+    def batch_action_values(self, environment_states):
+        return self.sum_batch_layers(self.q, environment_states)
 
     def run_learning_episode(self, render=False):
         if self.lambd > 0.0:
@@ -82,9 +84,7 @@ class CMACQ(CMACAlgorithm):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = [
                 r + self.gamma * self.q[l][s_[l], :].max() - self.q[l][s[l], a]
                 for l in range(self.n_layers)
@@ -98,7 +98,7 @@ class CMACQ(CMACAlgorithm):
                 else:
                     self.q[l][s[l], a] += self.alpha / self.n_layers * delta[l]
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
 
@@ -126,9 +126,7 @@ class CMACSARSA(CMACQ):
             if render:
                 self.environment.render()
 
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             a_ = self.get_action(epsilon_greedy=False)
             delta = [
                 r + self.gamma * self.q[l][s_[l], a_] - self.q[l][s[l], a]
@@ -143,7 +141,7 @@ class CMACSARSA(CMACQ):
                 else:
                     self.q[l][s[l], a] += self.alpha / self.n_layers * delta[l]
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
             s = s_
@@ -175,9 +173,7 @@ class CMACR(CMACQ):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = [
                 r - rho[l] + self.q[l][s_[l], :].max() - self.q[l][s[l], a]
                 for l in range(self.n_layers)
@@ -190,7 +186,7 @@ class CMACR(CMACQ):
                     e[l][s[l], :] *= self.lambd
                 else:
                     self.q[l][s[l], a] += self.alpha / self.n_layers * delta[l]
-            if a in self.get_greedy_actions(s):
+            if self.is_greedy(s, a):
                 for l in range(self.n_layers):
                     rho[l] += self.beta * (
                         r - rho[l]
@@ -198,6 +194,6 @@ class CMACR(CMACQ):
                         - self.q[l][s[l], :].max()
                     )
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
                 return self.environment
@@ -0,0 +1,118 @@
+import numpy as np
+from numpy import inf
+
+
+def bellman_backup(environment, V: np.ndarray, gamma: float) -> np.ndarray:
+    """Returns Q computed from V with one Bellman sweep over all of states
+        and actions. Reward of transition is a reward of next state and
+        absorbing states have no future value, like in learning episodes."""
+    next_states, rewards, absorbing = environment.compile()
+    future = np.where(absorbing, 0.0, V)
+    Q = rewards[next_states] + gamma * future[next_states]
+    Q[absorbing] = 0.0
+    return Q
+
+
+def value_iteration(environment, gamma=0.95, tolerance=1e-8,
+                    max_iterations=100000) -> tuple:
+    """Returns optimal (V, Q) of grid environment (class or instance)
+        computed with value iteration, stopped when Q changes by less than
+        tolerance."""
+    if not 0.0 <= gamma < 1.0:
+        raise ValueError("gamma must be in [0, 1) range")
+    next_states, rewards, absorbing = environment.compile()
+    Q = np.zeros(next_states.shape)
+    for i in range(max_iterations):
+        Q_ = bellman_backup(environment, Q.max(1), gamma)
+        converged = np.abs(Q_ - Q).max() < tolerance
+        Q = Q_
+        if converged:
+            break
+    return Q.max(1), Q
+
+
+def policy_iteration(environment, gamma=0.95, tolerance=1e-8,
+                     max_iterations=1000) -> tuple:
+    """Returns optimal (V, Q, policy) of grid environment (class or
+        instance) computed with policy iteration. Each policy is evaluated
+        with sweeps over all of states until V changes by less than
+        tolerance."""
+    if not 0.0 <= gamma < 1.0:
+        raise ValueError("gamma must be in [0, 1) range")
+    next_states, rewards, absorbing = environment.compile()
+    states = np.arange(len(next_states))
+    policy = np.zeros(len(next_states), dtype=np.intp)
+    V = np.zeros(len(next_states))
+    for i in range(max_iterations):
+        policy_next_states = next_states[states, policy]
+        policy_rewards = rewards[policy_next_states]
+        continuing = ~absorbing[policy_next_states] & ~absorbing
+        while True:
+            V_ = np.where(absorbing, 0.0, policy_rewards)
+            V_[continuing] += gamma * V[policy_next_states[continuing]]
+            converged = np.abs(V_ - V).max() < tolerance
+            V = V_
+            if converged:
+                break
+        Q = bellman_backup(environment, V, gamma)
+        # policy is changed only in states where it's not greedy, so ties
+        # don't make it oscillate
+        improvable = Q[states, policy] < Q.max(1) - tolerance
+        if not improvable.any():
+            break
+        policy[improvable] = Q[improvable].argmax(1)
+    return V, Q, policy
+
+
+def steps_to_goal(environment) -> np.ndarray:
+    """Returns minimal number of steps needed to reach goal (absorbing
+        state of positive reward) from each of states of grid environment,
+        inf for states from which goal cannot be reached."""
+    next_states, rewards, absorbing = environment.compile()
+    steps = np.where(absorbing & (rewards > 0.0), 0.0, inf)
+    while True:
+        steps_ = steps.copy()
+        steps_[~absorbing] = 1.0 + steps[next_states[~absorbing]].min(1)
+        if np.array_equal(steps_, steps):
+            return steps
+        steps = steps_
+
+
+def reachable_states(environment) -> np.ndarray:
+    """Returns mask of states which can be reached from starting position
+        of grid environment."""
+    next_states, rewards, absorbing = environment.compile()
+    grid = environment.grid
+    reached = np.zeros(len(next_states), dtype=bool)
+    frontier = np.array([environment.starting_position[0] * grid.shape[1]
+                         + environment.starting_position[1]])
+    while frontier.size:
+        reached[frontier] = True
+        frontier = np.unique(next_states[frontier[~absorbing[frontier]]])
+        frontier = frontier[~reached[frontier]]
+    return reached
+
+
+def compare_with_solution(algorithm, Q: np.ndarray) -> dict:
+    """Compares values learned by classic algorithm (Q table of Q, SARSA
+        and R or V table of AHC) with optimal Q, in non-absorbing states
+        reachable from starting position. Returns maximal and mean absolute
+        value error and fraction of states in which algorithm's greedy
+        action is optimal."""
+    environment = algorithm.environment
+    next_states, rewards, absorbing = environment.compile()
+    states = reachable_states(environment) & ~absorbing
+    if hasattr(algorithm, 'Q'):
+        errors = np.abs(algorithm.Q[states] - Q[states])
+    else:
+        errors = np.abs(algorithm.V[states] - Q[states].max(1))
+    values = np.array([
+        algorithm.action_values(s).copy() for s in np.where(states)[0]
+    ])
+    greedy = values.argmax(1)
+    optimal = Q[states, greedy] >= Q[states].max(1) - 1e-9
+    return {
+        'max_error': float(errors.max()),
+        'mean_error': float(errors.mean()),
+        'optimal_actions': float(optimal.mean())
+    }
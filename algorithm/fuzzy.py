@@ -2,6 +2,7 @@ import numpy as np
 from functools import reduce
 
 from .abstract import FuzzyAlgorithm
+from ..traces import create_eligibility_traces
 
 
 def phi(environment_state):
@@ -9,33 +10,151 @@ def phi(environment_state):
                            environment_state[::-1]))
 
 
+class StateFeatures:
+    """StateFeatures - active rules, their weights and Q vector (computed
+        lazily) of approximated environment state."""
+    __slots__ = ('state', 'rules', 'weights', 'Q')
+
+    def __init__(self, state, rules, weights):
+        self.state = state
+        self.rules = rules
+        self.weights = weights
+        self.Q = None
+
+
+class StepCache:
+    """StepCache - features of states observed in last steps of episode.
+        Features of each state are computed once, when state is observed,
+        and reused when it becomes previous state in next step. Q vectors
+        are invalidated only by q update."""
+
+    def __init__(self, size=2):
+        self.size = size
+        self.entries = []
+
+    def get(self, environment_state):
+        for features in self.entries:
+            if features.state is environment_state:
+                return features
+        return None
+
+    def add(self, features):
+        self.entries.insert(0, features)
+        del self.entries[self.size:]
+        return features
+
+    def invalidate(self):
+        for features in self.entries:
+            features.Q = None
+
+
 class FQ(FuzzyAlgorithm):
+    tables = ('q',)
 
     def __init__(self, environment, lambd=0.0, epsilon=0.005, gamma=0.95,
                  alpha=0.1, *args, **kwargs):
         super().__init__(environment, lambd, epsilon, gamma, alpha,
                          *args, **kwargs)
+        self.cache = None
         self.q = np.array([
             np.zeros(self.environment.approximator.state_shape)
             for i in self.actions
         ])
 
+    @property
+    def q(self):
+        return self._q
+
+    @q.setter
+    def q(self, value):
+        self._q = value
+        # view of q with all of fuzzy rules flattened, so active rules can be
+        # accessed with their flat indices
+        self.q_rules = value.reshape(len(value), -1)
+
+    def features(self, environment_state) -> StateFeatures:
+        if self.cache is not None:
+            features = self.cache.get(environment_state)
+            if features is not None:
+                return features
+        features = StateFeatures(
+            environment_state,
+            *self.environment.approximator.active_rules(environment_state)
+        )
+        if self.cache is not None:
+            self.cache.add(features)
+        return features
+
     def Q(self, environment_state):
-        s = environment_state
-        phi_s = phi(s)
-        if phi_s.sum() == 0.0:
-            return 0.0
-        nominator = np.array([np.sum(self.q[i] * phi_s) for i in self.actions])
-        return nominator / phi_s.sum()
+        features = self.features(environment_state)
+        if features.Q is None:
+            weights_sum = features.weights.sum()
+            if weights_sum == 0.0:
+                features.Q = np.zeros(len(self.actions))
+            else:
+                features.Q = self.q_rules[:, features.rules] \
+                    @ features.weights / weights_sum
+        return features.Q
+
+    def action_values(self, environment_state):
+        return self.Q(environment_state)
+
+    def batch_action_values(self, environment_states):
+        """Returns (N, n_actions) Q values for (N, n_state_variables,
+            n_membership_functions) tensor of grades (as returned by
+            FuzzyApproximator.approximate_states), contracting q with grades
+            of one variable at a time instead of building rules weights."""
+        grades = np.asarray(environment_states, dtype=float)
+        shape = self.environment.approximator.state_shape
+        values = np.moveaxis(self.q, 0, -1)
+        values = np.einsum('ni,i...->n...', grades[:, 0, :shape[0]], values)
+        for i in range(1, len(shape)):
+            values = np.einsum('ni,ni...->n...', grades[:, i, :shape[i]],
+                               values)
+        weights_sums = grades.sum(2).prod(1)
+        active = weights_sums != 0.0
+        values[active] /= weights_sums[active, np.newaxis]
+        values[~active] = 0.0
+        return values
 
     def get_greedy_actions(self, environment_state=None):
-        s = environment_state or self.environment.state
-        Q = self.Q(s)
-        return np.where(Q == Q.max())[0]
+        if environment_state is not None:
+            shape = self.environment.approximator.state_shape
+            if len(environment_state) != len(shape) or any(
+                len(grades) != size
+                for grades, size in zip(environment_state, shape)
+            ):
+                raise ValueError(f"environment state must consist of" +
+                                 f" membership grades of fuzzy sets of" +
+                                 f" sizes {shape}")
+        return super().get_greedy_actions(environment_state)
+
+    def create_traces(self):
+        """Returns eligibility traces of q rules. They are sparse also when
+            trace_cutoff is None (with zero cutoff, so only traces decayed
+            to subnormal values are dropped), because each step visits only
+            rules active in state and update touches only eligible rules."""
+        cutoff = 0.0 if self.trace_cutoff is None else self.trace_cutoff
+        return create_eligibility_traces(self.q_rules.shape, cutoff)
+
+    def update(self, a, environment_state, step, e=None):
+        """Updates q of action a with step, only in rules active in given
+            state or in rules being eligible, if eligibility traces are
+            given."""
+        features = self.features(environment_state)
+        if e is None:
+            self.q_rules[a, features.rules] += step * features.weights
+        else:
+            e.visit((a, features.rules), features.weights)
+            e.update(self.q_rules, step)
+        if self.cache is not None:
+            self.cache.invalidate()
 
     def run_learning_episode(self, render=False):
+        e = None
         if self.lambd > 0.0:
-            e = np.zeros(self.q.shape)
+            e = self.create_traces()
+        self.cache = StepCache()
 
         while True:
             if render:
@@ -43,19 +162,15 @@ class FQ(FuzzyAlgorithm):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = r + self.gamma * self.Q(s_).max() - self.Q(s)[a]
-            if self.lambd > 0.0:
-                e[a] += phi(s)
-                self.q += self.alpha * delta * e
-                e *= self.gamma * self.lambd
-            else:
-                self.q[a] += self.alpha * delta * phi(s)
+            self.update(a, s, self.alpha * delta, e)
+            if e is not None:
+                e.decay(self.gamma * self.lambd)
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
+                self.cache = None
                 return self.environment
 
 
@@ -72,8 +187,10 @@ class FSARSA(FQ):
         ])
 
     def run_learning_episode(self, render=False):
+        e = None
         if self.lambd > 0.0:
-            e = np.zeros(self.q.shape)
+            e = self.create_traces()
+        self.cache = StepCache()
         s = self.environment.state
         a = self.get_action(epsilon_greedy=False)
 
@@ -81,20 +198,16 @@ class FSARSA(FQ):
             if render:
                 self.environment.render()
 
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             a_ = self.get_action(epsilon_greedy=False)
             delta = r + self.gamma * self.Q(s_)[a_] - self.Q(s)[a]
-            if self.lambd > 0.0:
-                e[a] += phi(s)
-                self.q += self.alpha * delta * e
-                e *= self.gamma * self.lambd
-            else:
-                self.q[a] += self.alpha * delta * phi(s)
+            self.update(a, s, self.alpha * delta, e)
+            if e is not None:
+                e.decay(self.gamma * self.lambd)
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
+                self.cache = None
                 return self.environment
             s = s_
             a = a_
@@ -110,8 +223,10 @@ class FR(FQ):
         self.beta = beta
 
     def run_learning_episode(self, render=False):
+        e = None
         if self.lambd > 0.0:
-            e = np.zeros(self.q.shape)
+            e = self.create_traces()
+        self.cache = StepCache()
         rho = 0.0
 
         while True:
@@ -120,20 +235,16 @@ class FR(FQ):
 
             s = self.environment.state
             a = self.get_action()
-            self.environment.do_action(a)
-            r = self.environment.reward
-            s_ = self.environment.state
+            s_, r, done = self.environment.step(a)
             delta = r - rho + self.Q(s_).max() - self.Q(s)[a]
-            if self.lambd > 0.0:
-                e[a] += phi(s)
-                self.q += self.alpha * delta * e
-                e *= self.lambd
-            else:
-                self.q[a] += self.alpha * delta * phi(s)
-            if a in self.get_greedy_actions(s):
+            self.update(a, s, self.alpha * delta, e)
+            if e is not None:
+                e.decay(self.lambd)
+            if self.is_greedy(s, a):
                 rho += self.beta \
                     * (r - rho + self.Q(s_).max() - self.Q(s).max())
 
-            if self.environment.done:
+            if done:
                 self.environment.close()
+                self.cache = None
                 return self.environment
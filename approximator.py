@@ -1,8 +1,10 @@
+import numpy as np
+from bisect import bisect_right
 from functools import reduce
 from numpy import inf
 
 from .abstract import Approximator
-from .fuzzy import FuzzySet
+from .fuzzy import FuzzySet, membership_grades
 from .misc import window
 
 
@@ -17,6 +19,12 @@ class TableApproximator(Approximator):
         self._possible_states = [i for i in range(reduce(
             lambda x, y: x * y, self.state_shape
         ))]
+        self._ranges = [sorted(vr) for vr in self.state_variables_ranges]
+        self._bins = [np.array(ranges, dtype=float) for ranges in self._ranges]
+        self._strides = tuple(
+            reduce(lambda x, y: x * y, self.state_shape[i+1::], 1)
+            for i in range(len(self.state_shape))
+        )
 
     @property
     def possible_states(self):
@@ -47,13 +55,25 @@ class TableApproximator(Approximator):
             for i in range(len(approximated_state_variables))
         ])
 
+    @property
+    def strides(self):
+        return self._strides
+
     def approximate_state(self, state_variables: tuple) -> int:
-        asv = [
-            self.approximate_state_variable(var, shape)
-            for var, shape
-            in zip(state_variables, self.state_variables_ranges)
-        ]
-        return self.encode_state(asv, self.state_shape)
+        state = 0
+        for value, ranges, stride in zip(state_variables, self._ranges,
+                                         self._strides):
+            state += stride * bisect_right(ranges, value)
+        return state
+
+    def approximate_states(self, observations) -> np.ndarray:
+        observations = np.asarray(observations, dtype=float)
+        states = np.zeros(len(observations), dtype=np.intp)
+        for i, (bins, stride) in enumerate(zip(self._bins, self._strides)):
+            if bins.size:
+                states += stride * np.searchsorted(bins, observations[:, i],
+                                                   side='right')
+        return states
 
 
 class CMACApproximator(Approximator):
@@ -68,6 +88,24 @@ class CMACApproximator(Approximator):
             for ranges in self.layers_ranges
         ]
         self._possible_states = tuple(l.possible_states for l in self.layers)
+        self.offsets = np.full((
+            self.n_layers,
+            self.n_state_variables,
+            max(len(rang) for ranges in self.layers_ranges for rang in ranges)
+        ), inf)
+        for l, ranges in enumerate(self.layers_ranges):
+            for v, rang in enumerate(ranges):
+                self.offsets[l, v, :len(rang)] = rang
+        # approximating state compares observation gathered by variable
+        # index with all of flattened offsets at once and sums strides of
+        # reached offsets of each layer with block diagonal strides matrix
+        self._variable_index = np.indices(self.offsets.shape)[1].ravel()
+        self._strides_matrix = np.zeros((self.offsets.size, self.n_layers),
+                                        dtype=np.intp)
+        for l, layer in enumerate(self.layers):
+            self._strides_matrix[l * self.offsets[l].size:
+                                 (l + 1) * self.offsets[l].size, l] = \
+                np.repeat(layer.strides, self.offsets.shape[2])
 
     @property
     def n_layers(self):
@@ -105,7 +143,16 @@ class CMACApproximator(Approximator):
         return layers_ranges
 
     def approximate_state(self, state_variables: tuple) -> tuple:
-        return tuple(l.approximate_state(state_variables) for l in self.layers)
+        state_variables = np.asarray(state_variables)
+        reached = np.less_equal(self.offsets.ravel(),
+                                state_variables[self._variable_index])
+        return tuple(np.dot(reached, self._strides_matrix).tolist())
+
+    def approximate_states(self, observations) -> np.ndarray:
+        observations = np.asarray(observations, dtype=float)
+        reached = np.less_equal(self.offsets.ravel(),
+                                observations[:, self._variable_index])
+        return np.dot(reached, self._strides_matrix)
 
     def generate_layers_ranges(self) -> list:
         state_variables_ranges_divided = [
@@ -134,6 +181,10 @@ class FuzzyApproximator(Approximator):
         self.state_shape = tuple(
             len(fuzzy_set.membership_functions) for fuzzy_set in self.fuzzy_sets
         )
+        self.strides = tuple(
+            reduce(lambda x, y: x * y, self.state_shape[i+1::], 1)
+            for i in range(len(self.state_shape))
+        )
 
     @property
     def fuzzy_sets(self):
@@ -153,6 +204,16 @@ class FuzzyApproximator(Approximator):
                 raise TypeError(f"each object in fuzzy_sets list must be a" +
                                 f" FuzzySet, given {type(obj)}")
         self._fuzzy_sets = value
+        self._sizes = [len(fs.membership_functions) for fs in value]
+        # slopes of all fuzzy sets padded with never active functions to
+        # (2, n_state_variables, max number of membership functions, 2) array
+        self.slopes = None
+        if all(fs.slopes is not None for fs in value):
+            self.slopes = np.zeros((2, len(value), max(self._sizes), 2))
+            self.slopes[0] = FuzzySet.huge
+            self.slopes[1] = [1.0, -1.0]
+            for i, fs in enumerate(value):
+                self.slopes[:, i, :self._sizes[i]] = fs.slopes
 
     @property
     def possible_states(self):
@@ -193,7 +254,44 @@ class FuzzyApproximator(Approximator):
         return mfr
 
     def approximate_state(self, state_variables):
-        return [
-            self.fuzzy_sets[i].membership_grades(state_variable)
-            for i, state_variable in enumerate(state_variables)
-        ]
+        if self.slopes is None:
+            return [
+                self.fuzzy_sets[i].membership_grades(state_variable)
+                for i, state_variable in enumerate(state_variables)
+            ]
+        grades = membership_grades(
+            np.asarray(state_variables, dtype=float)[:, np.newaxis],
+            self.slopes
+        )
+        return [grades[i, :size] for i, size in enumerate(self._sizes)]
+
+    def active_rules(self, environment_state) -> tuple:
+        """Returns flat indices of fuzzy rules (cells of state_shape table)
+            which are active in given approximated state and their weights.
+            Weights are equal to nonzero values of outer product of all of
+            membership grades, so for fuzzy sets generated by svr2mfr there
+            are at most 2 ** n_state_variables active rules."""
+        rules, weights = [0], [1.0]
+        for grades, stride in zip(environment_state[::-1], self.strides[::-1]):
+            active = [
+                (i * stride, grade)
+                for i, grade in enumerate(grades.tolist()) if grade
+            ]
+            rules = [i + rule for i, grade in active for rule in rules]
+            weights = [w * grade for i, grade in active for w in weights]
+        return np.array(rules, dtype=np.intp), np.array(weights)
+
+    def approximate_states(self, observations) -> np.ndarray:
+        """Returns (N, n_state_variables, n_membership_functions) grades
+            tensor for (N, n_state_variables) observations. Grades of fuzzy
+            sets having less membership functions are padded with zeros."""
+        observations = np.asarray(observations, dtype=float)
+        if self.slopes is not None:
+            return membership_grades(observations[:, :, np.newaxis],
+                                     self.slopes)
+        grades = np.zeros((len(observations), self.n_state_variables,
+                           max(self._sizes)))
+        for i, fuzzy_set in enumerate(self.fuzzy_sets):
+            grades[:, i, :self._sizes[i]] = \
+                fuzzy_set.membership_grades(observations[:, i])
+        return grades
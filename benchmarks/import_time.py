@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Measures time of importing rltoolbox modules in fresh interpreters (the
+way sweep workers start) and checks that none of them imports matplotlib.
+Exits with status 1 if any module imports matplotlib or median import time
+exceeds --max-ms."""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import rltoolbox
+
+
+MODULES = [
+    'rltoolbox.algorithm.classic',
+    'rltoolbox.algorithm.cmac',
+    'rltoolbox.algorithm.fuzzy',
+    'rltoolbox.environment.continuous',
+    'rltoolbox.environment.grid',
+    'rltoolbox.experiment'
+]
+CHECK = "import sys, {module}; " + \
+    "sys.exit(any(m.startswith('matplotlib') for m in sys.modules))"
+
+
+def environment_variables() -> dict:
+    path = os.path.dirname(os.path.dirname(os.path.abspath(
+        rltoolbox.__file__
+    )))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [path] + [p for p in [env.get('PYTHONPATH')] if p]
+    )
+    return env
+
+
+def import_time(statement: str, env: dict, n_repeats: int) -> tuple:
+    """Returns median wall time [ms] of running statement in fresh
+        interpreter and its exit status."""
+    times = []
+    for i in range(n_repeats):
+        start = time.perf_counter()
+        status = subprocess.call([sys.executable, '-c', statement], env=env)
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)[len(times) // 2], status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None)
+    args = parser.parse_args(argv)
+    env = environment_variables()
+
+    failed = False
+    baseline, _ = import_time('pass', env, args.repeats)
+    pyplot, _ = import_time('import matplotlib.pyplot', env, args.repeats)
+    print(f"{'interpreter startup':40} {baseline:8.1f} ms")
+    print(f"{'matplotlib.pyplot (for reference)':40} {pyplot:8.1f} ms")
+    for module in MODULES:
+        ms, status = import_time(CHECK.format(module=module), env,
+                                 args.repeats)
+        note = ''
+        if status:
+            note, failed = '  imports matplotlib!', True
+        elif args.max_ms is not None and ms > args.max_ms:
+            note, failed = f'  exceeds {args.max_ms} ms', True
+        print(f"{module:40} {ms:8.1f} ms{note}")
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
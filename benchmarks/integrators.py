@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Measures accuracy and cost of integrators of continuous models. Each
+model is simulated for fixed time with fixed schedule of controls, using
+each of integrators and several timesteps, and its trajectory is compared
+with reference trajectory integrated with RK4 at much smaller timestep.
+Error is maximal absolute difference of observation variables, divided by
+range of each variable in reference trajectory."""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from rltoolbox.environment.integrators import integrators
+from rltoolbox.environment.models import BallBeam, CartPole, MountainCar
+
+
+# model, model params, controls (switched every switch_time), switch_time,
+# horizon, timesteps, reference timestep
+CASES = {
+    'BallBeam': (BallBeam, {}, [0.1, -0.1], 0.4, 2.0,
+                 [0.01, 0.02, 0.05, 0.1, 0.2], 0.0005),
+    'MountainCar': (MountainCar, {}, [1.0, -1.0], 20.0, 100.0,
+                    [0.5, 1.0, 2.0, 5.0, 10.0], 0.01),
+    'CartPole': (CartPole, {'init_pole_angle': 0.05}, [10.0, -10.0], 0.2,
+                 1.0, [0.005, 0.01, 0.02, 0.05, 0.1], 0.0005)
+}
+
+
+def simulate(model_class, params: dict, integrator: str, timestep: float,
+             controls: list, switch_time: float, horizon: float) -> tuple:
+    """Returns (n_steps + 1, n_variables) observations, including initial
+        one, and mean time of step [s]."""
+    model = model_class(timestep=timestep, integrator=integrator, **params)
+    n_steps = int(round(horizon / timestep))
+    steps_per_switch = int(round(switch_time / timestep))
+    observations = [model.observation]
+    start = time.perf_counter()
+    for n in range(n_steps):
+        control = controls[(n // steps_per_switch) % len(controls)]
+        observations.append(model.step(control))
+    duration = time.perf_counter() - start
+    return np.array(observations), duration / n_steps
+
+
+def trajectory_error(observations: np.ndarray, reference: np.ndarray,
+                     timestep: float, reference_timestep: float) -> float:
+    ratio = int(round(timestep / reference_timestep))
+    sampled = reference[::ratio][:len(observations)]
+    scale = reference.max(0) - reference.min(0)
+    scale[scale == 0.0] = 1.0
+    return float((np.abs(observations - sampled) / scale).max())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--models', nargs='*', default=list(CASES),
+                        choices=list(CASES))
+    parser.add_argument('--output', help="save results into JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.models:
+        model_class, params, controls, switch_time, horizon, timesteps, \
+            reference_timestep = CASES[name]
+        reference, _ = simulate(model_class, params, 'rk4',
+                                reference_timestep, controls, switch_time,
+                                horizon)
+        print(f"{name} (native integrator:" +
+              f" {model_class.native_integrator})")
+        print(f"{'integrator':15} {'timestep':>9} {'error':>10}" +
+              f" {'us/step':>9}")
+        for integrator in integrators:
+            for timestep in timesteps:
+                if model_class is MountainCar and timestep != 1.0 and \
+                        integrator == MountainCar.native_integrator:
+                    # native update ignores timestep
+                    continue
+                observations, step_time = simulate(
+                    model_class, params, integrator, timestep, controls,
+                    switch_time, horizon
+                )
+                error = trajectory_error(observations, reference, timestep,
+                                         reference_timestep)
+                results[f"{name}/{integrator}/{timestep}"] = {
+                    'error': error,
+                    'step_time': step_time
+                }
+                print(f"{integrator:15} {timestep:9g} {error:10.2e}" +
+                      f" {step_time * 1e6:9.2f}")
+        print()
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
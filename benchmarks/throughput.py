@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+"""Measures learning throughput (environment steps per second) of every
+algorithm family on environments it's used with, with fixed seeds and fixed
+episode budgets. Throughput of case is median of several samples, each of
+which repeats learning for at least minimal time, and it's also given
+relative to throughput of reference case (Q on GRID69 without traces),
+sampled alternately with each case, so results aren't biased by changing
+load and results of different machines can be compared. Results are printed
+and can be saved as JSON and compared with JSON baseline: cases which
+relative throughput is lower than baseline one by more than threshold
+fraction are reported as regressions and make exit status 1. By default
+results are compared with throughput_baseline.json committed next to this
+script (comparison is skipped with --baseline ''). Baseline is refreshed
+with --baseline '' --output benchmarks/throughput_baseline.json, run with
+default budget from repository root."""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from rltoolbox.algorithm import classic, cmac, fuzzy
+from rltoolbox.approximator import (
+    CMACApproximator,
+    FuzzyApproximator,
+    TableApproximator
+)
+from rltoolbox.environment import continuous, grid
+
+
+LAMBDAS = (0.0, 0.5)
+# cutoffs of sparse eligibility traces benchmarked with lambda > 0
+TRACE_CUTOFFS = (0.0, 0.01)
+REFERENCE_CASE = 'Q/GRID69/lambda=0.0'
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'throughput_baseline.json')
+
+
+def cases() -> dict:
+    """Returns dict of benchmark cases: name -> (algorithm class,
+        environment class, approximator class, approximator params,
+        algorithm params)."""
+    cases = {}
+    for lambd in LAMBDAS:
+        for algorithm in (classic.Q, classic.SARSA, classic.R, classic.AHC):
+            for environment in (grid.GRID69, grid.GRID2436):
+                cases[f"{algorithm.__name__}/{environment.__name__}/" +
+                      f"lambda={lambd}"] = (
+                    algorithm, environment, None, {}, {'lambd': lambd}
+                )
+            for environment in (continuous.BallBeam, continuous.MountainCar,
+                                continuous.CartPole):
+                cases[f"{algorithm.__name__}/{environment.__name__}/" +
+                      f"table/lambda={lambd}"] = (
+                    algorithm, environment, TableApproximator, {},
+                    {'lambd': lambd}
+                )
+        for algorithm in (cmac.CMACQ, cmac.CMACSARSA, cmac.CMACR,
+                          cmac.CMACAHC):
+            for n_layers in (2, 4, 8):
+                cases[f"{algorithm.__name__}/BallBeam/" +
+                      f"layers={n_layers}/lambda={lambd}"] = (
+                    algorithm, continuous.BallBeam, CMACApproximator,
+                    {'n_layers': n_layers}, {'lambd': lambd}
+                )
+        for algorithm in (fuzzy.FQ, fuzzy.FSARSA, fuzzy.FR):
+            for environment in (continuous.BallBeam, continuous.CartPole):
+                cases[f"{algorithm.__name__}/{environment.__name__}/" +
+                      f"lambda={lambd}"] = (
+                    algorithm, environment, FuzzyApproximator, {},
+                    {'lambd': lambd}
+                )
+    for trace_cutoff in TRACE_CUTOFFS:
+        params = {'lambd': LAMBDAS[-1], 'trace_cutoff': trace_cutoff}
+        for algorithm in (classic.Q, classic.SARSA):
+            for environment in (grid.GRID69, grid.GRID2436):
+                cases[f"{algorithm.__name__}/{environment.__name__}/" +
+                      f"lambda={LAMBDAS[-1]}/cutoff={trace_cutoff}"] = (
+                    algorithm, environment, None, {}, params
+                )
+        for algorithm in (fuzzy.FQ, fuzzy.FSARSA):
+            cases[f"{algorithm.__name__}/CartPole/lambda={LAMBDAS[-1]}/" +
+                  f"cutoff={trace_cutoff}"] = (
+                algorithm, continuous.CartPole, FuzzyApproximator, {}, params
+            )
+    return cases
+
+
+def sample(case: tuple, n_episodes: int, max_steps: int, seed: int,
+           min_time: float) -> tuple:
+    """Returns number of steps of learning and throughput of learning
+        repeated from scratch (with the same seed) for at least min_time
+        seconds."""
+    algorithm, environment, approximator, approximator_params, params = case
+    steps, seconds = 0, 0.0
+    while seconds < min_time or steps == 0:
+        env = environment(max_steps=max_steps)
+        if approximator is not None:
+            env.approximate_with(approximator, **approximator_params)
+        alg = algorithm(env, seed=seed, **params)
+        start = time.perf_counter()
+        alg.learn(n_episodes, print_status=False)
+        seconds += time.perf_counter() - start
+        steps += sum(alg.steps_per_episode)
+    return sum(alg.steps_per_episode), steps / seconds
+
+
+def run_case(case: tuple, reference: tuple, n_episodes: int, max_steps: int,
+             seed: int, n_repeats: int, min_time: float) -> dict:
+    """Returns number of steps of learning, median throughput of n_repeats
+        samples and median ratio of throughput to throughput of reference
+        case, sampled alternately with case."""
+    rates, ratios = [], []
+    for i in range(n_repeats):
+        _, reference_rate = sample(reference, n_episodes, max_steps, seed,
+                                   min_time)
+        steps, rate = sample(case, n_episodes, max_steps, seed, min_time)
+        rates.append(rate)
+        ratios.append(rate / reference_rate)
+    return {
+        'steps': steps,
+        'steps_per_second': float(np.median(rates)),
+        'relative': float(np.median(ratios))
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Returns (name, relative throughput ratio) of cases which relative
+        throughput is lower than baseline one by more than threshold
+        fraction."""
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result['relative'] / baseline[name]['relative']
+            if ratio < 1.0 - threshold:
+                regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--episodes', type=int, default=3)
+    parser.add_argument('--max-steps', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=7,
+                        help="median of repeats samples is taken")
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help="minimal duration of sample [s]")
+    parser.add_argument('--filter', default='',
+                        help="run only cases which names contain it")
+    parser.add_argument('--output', help="save results into JSON file")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help="compare with JSON results ('' to skip)")
+    parser.add_argument('--threshold', type=float, default=0.3,
+                        help="allowed throughput drop (fraction)")
+    args = parser.parse_args(argv)
+
+    all_cases = cases()
+    results = {}
+    for name, case in all_cases.items():
+        if args.filter in name:
+            results[name] = run_case(
+                case, all_cases[REFERENCE_CASE], args.episodes,
+                args.max_steps, args.seed, args.repeats, args.min_time
+            )
+            print(f"{name:45} {results[name]['steps_per_second']:12.0f}" +
+                  f" steps/s {results[name]['relative']:8.3f} of reference",
+                  flush=True)
+    report = {
+        'config': {
+            'episodes': args.episodes,
+            'max_steps': args.max_steps,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline['config']['episodes'] != args.episodes or \
+                baseline['config']['max_steps'] != args.max_steps:
+            print("warning: baseline was measured with different budget")
+        regressions = compare(results, baseline['results'], args.threshold)
+        for name, ratio in regressions:
+            print(f"regression: {name} runs at {ratio:.0%} of baseline")
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
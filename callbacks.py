@@ -0,0 +1,118 @@
+import json
+import time
+
+from .profiling import Profiler
+
+
+class Callback:
+    """Callback - receives events of Algorithm.learn. Metrics of finished
+        episode are dict of episode (number), steps, wall_time (seconds),
+        steps_per_second (0.0 if wall_time is too short to be measured),
+        return (sum of rewards) and profile (phases report of
+        profiling.Profiler, None if episode wasn't profiled). on_learn_end
+        is called also when learning is interrupted by exception."""
+
+    def on_learn_start(self, algorithm, n_episodes: int):
+        pass
+
+    def on_episode_start(self, algorithm):
+        pass
+
+    def on_episode_end(self, algorithm, metrics: dict):
+        pass
+
+    def on_checkpoint(self, algorithm, path: str):
+        pass
+
+    def on_learn_end(self, algorithm):
+        pass
+
+
+class ConsolePrinter(Callback):
+    """ConsolePrinter - prints status of finished episode, but not more often
+        than once in interval seconds. Last episode of learning is always
+        printed."""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._last_print = None
+        self._pending = None
+
+    def on_learn_start(self, algorithm, n_episodes):
+        self._last_print = None
+        self._pending = None
+
+    def on_episode_end(self, algorithm, metrics):
+        now = time.monotonic()
+        if self._last_print is not None and \
+                now - self._last_print < self.interval:
+            self._pending = metrics
+            return
+        self.print(algorithm, metrics)
+        self._last_print = now
+        self._pending = None
+
+    def on_learn_end(self, algorithm):
+        if self._pending is not None:
+            self.print(algorithm, self._pending)
+            self._pending = None
+
+    def print(self, algorithm, metrics: dict):
+        status = f"environment: {algorithm.environment.name}\n" + \
+            f"algorithm:   {algorithm.name}\n" + \
+            f"episode:     {metrics['episode']}\n" + \
+            f"steps:       {metrics['steps']}" + \
+            f" ({metrics['steps_per_second']:.0f} steps/s)\n" + \
+            f"return:      {metrics['return']:g}\n"
+        if metrics['profile'] is not None:
+            status += f"profile:     {Profiler.format(metrics['profile'])}\n"
+        print(status)
+
+
+class MetricsCollector(Callback):
+    """MetricsCollector - keeps metrics of all of episodes in memory, as dict
+        of lists (one for each of metrics) and list of checkpoints paths."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.checkpoints = []
+
+    def on_episode_end(self, algorithm, metrics):
+        for name, value in metrics.items():
+            self.metrics.setdefault(name, []).append(value)
+
+    def on_checkpoint(self, algorithm, path):
+        self.checkpoints.append((algorithm.episodes, path))
+
+
+class JSONLWriter(Callback):
+    """JSONLWriter - appends metrics of each episode as JSON line to file.
+        Lines are buffered and written in batches of batch_size lines, and
+        at the end of learning and at checkpoints."""
+
+    def __init__(self, path: str, batch_size=100):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.path = path
+        self.batch_size = batch_size
+        self._lines = []
+
+    def on_episode_end(self, algorithm, metrics):
+        self._lines.append(json.dumps(
+            dict(metrics, algorithm=algorithm.name,
+                 environment=algorithm.environment.name)
+        ))
+        if len(self._lines) >= self.batch_size:
+            self.flush()
+
+    def on_checkpoint(self, algorithm, path):
+        self.flush()
+
+    def on_learn_end(self, algorithm):
+        self.flush()
+
+    def flush(self):
+        if self._lines:
+            with open(self.path, 'a') as file:
+                file.write('\n'.join(self._lines) + '\n')
+            self._lines = []
@@ -0,0 +1,75 @@
+import json
+import numpy as np
+import os
+import struct
+import zipfile
+from numpy.lib import format as npy_format
+
+
+def to_json(obj):
+    "Converts numpy objects, which json module can't serialize"
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj)} is not JSON serializable")
+
+
+def normalize(metadata: dict) -> dict:
+    "Returns metadata as it will be loaded from file, e.g. with lists"
+    return json.loads(json.dumps(metadata, default=to_json))
+
+
+def save_arrays(path: str, arrays: dict, metadata: dict):
+    """Saves arrays and JSON serializable metadata into uncompressed .npz
+        file. File is written to temporary file first and then renamed, so
+        checkpoint being overwritten is never left broken."""
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        np.savez(file, metadata=np.array(json.dumps(metadata,
+                                                    default=to_json)),
+                 **arrays)
+    os.replace(temporary_path, path)
+
+
+def memmap_npz_member(path: str, info: zipfile.ZipInfo, mmap_mode: str):
+    """Returns memory map of array stored (uncompressed) in .npz file."""
+    with open(path, 'rb') as file:
+        # local file header is 30 bytes long, followed by file name and
+        # extra field, which lengths are stored at its end
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack('<HH', file.read(4))
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+        version = npy_format.read_magic(file)
+        if version == (1, 0):
+            header = npy_format.read_array_header_1_0(file)
+        elif version == (2, 0):
+            header = npy_format.read_array_header_2_0(file)
+        else:
+            raise ValueError(f"unsupported .npy format version {version}")
+        shape, fortran_order, dtype = header
+        offset = file.tell()
+    if dtype.hasobject:
+        raise ValueError(f"cannot memory map object array {info.filename}")
+    return np.memmap(path, dtype=dtype, mode=mmap_mode, offset=offset,
+                     shape=shape, order='F' if fortran_order else 'C')
+
+
+def load_arrays(path: str, mmap_mode: str = None) -> tuple:
+    """Returns arrays and metadata saved with save_arrays. Arrays are memory
+        mapped with given mode ('r', 'r+' or 'c') instead of being read,
+        if mmap_mode is given."""
+    with np.load(path, allow_pickle=False) as npz:
+        metadata = json.loads(str(npz['metadata']))
+        names = [name for name in npz.files if name != 'metadata']
+        if mmap_mode is None:
+            return {name: npz[name] for name in names}, metadata
+    with zipfile.ZipFile(path) as archive:
+        infos = {info.filename: info for info in archive.infolist()}
+    arrays = {}
+    for name in names:
+        info = infos[name + '.npy']
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"cannot memory map compressed array {name}")
+        arrays[name] = memmap_npz_member(path, info, mmap_mode)
+    return arrays, metadata
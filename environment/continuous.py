@@ -17,15 +17,21 @@ class BallBeam(Environment):
     ]
     max_steps = 100000
 
-    @property
-    def reward(self):
-        if self.is_state_absorbing():
+    def get_reward(self, absorbing):
+        if absorbing:
             return -1.0
         return 0.0
 
     def is_state_absorbing(self):
         return abs(self.model.ball_position) >= self.model.beam_length / 2
 
+    def repeat_action(self, action_index):
+        # only the last of timesteps can be absorbing and rewarded
+        self.model.advance(self.actions[action_index], self.action_repeat,
+                           self.model.beam_length / 2)
+        absorbing = self.is_state_absorbing()
+        return absorbing, self.get_reward(absorbing)
+
 
 class MountainCar(Environment):
     model = models.MountainCar
@@ -37,9 +43,8 @@ class MountainCar(Environment):
     ]
     max_steps = 100000
 
-    @property
-    def reward(self):
-        if self.is_state_absorbing():
+    def get_reward(self, absorbing):
+        if absorbing:
             return 1.0
         return 0.0
 
@@ -59,9 +64,8 @@ class CartPole(Environment):
     ]
     max_steps = 100000
 
-    @property
-    def reward(self):
-        if self.is_state_absorbing():
+    def get_reward(self, absorbing):
+        if absorbing:
             return -1.0
         return 0.0
 
@@ -21,25 +21,94 @@ class GridEnvironment(Environment):
     actions = Grid.actions
     max_steps = 1000
 
-    def __init__(self, max_steps=None, *args, **kwargs):
+    def __init__(self, max_steps=None, *args, recording='count',
+                 recording_size=None, action_repeat=1, **kwargs):
         max_steps = max_steps or self.max_steps
         super().__init__(max_steps, init_agent_position=self.starting_position,
-                         grid=self.grid, walls_mark=self.walls_mark)
+                         grid=self.grid, walls_mark=self.walls_mark,
+                         recording=recording, recording_size=recording_size,
+                         action_repeat=action_repeat)
+        self.next_states, self.rewards, self.absorbing = self.compile()
+        # tables converted to lists, which are indexed faster with ints
+        self._next_states = self.next_states.tolist()
+        self._rewards = self.rewards.tolist()
+        self._absorbing = self.absorbing.tolist()
+        self._positions = [
+            divmod(s, self.grid.shape[1]) for s in range(self.grid.size)
+        ]
+
+    @classmethod
+    def compile(cls) -> tuple:
+        """Returns (next_states[S, A], rewards[S], absorbing[S]) arrays
+            describing transitions of grid, which are computed once for each
+            grid environment class."""
+        if cls.__dict__.get('_tables') is None:
+            rows, columns = np.indices(cls.grid.shape)
+            states = rows * cls.grid.shape[1] + columns
+            next_states = np.empty((cls.grid.size, len(cls.actions)),
+                                   dtype=np.intp)
+            for a, action in enumerate(cls.actions):
+                move = Grid.moves[action]
+                row, column = rows + move[0], columns + move[1]
+                possible = (row >= 0) & (row < cls.grid.shape[0]) & \
+                    (column >= 0) & (column < cls.grid.shape[1])
+                row, column = row.clip(0, cls.grid.shape[0] - 1), \
+                    column.clip(0, cls.grid.shape[1] - 1)
+                if cls.walls_mark is not None:
+                    possible &= cls.grid[row, column] != cls.walls_mark
+                next_states[:, a] = np.where(
+                    possible, row * cls.grid.shape[1] + column, states
+                ).ravel()
+            rewards = cls.grid.astype(float).ravel()
+            cls._tables = (next_states, rewards, rewards != 0.0)
+        return cls._tables
+
+    def get_reward(self, absorbing):
+        return self._rewards[self.state]
 
     @property
-    def reward(self):
-        return self.model.grid[self.model.observation]
+    def done(self) -> bool:
+        return self._absorbing[self.state] or \
+            self.trajectory.n_steps >= self.max_steps
 
     @property
     def states(self):
         return list(range(self.grid.size))
 
+    def step(self, action_index):
+        if self.action_repeat == 1:
+            self.state = state = self._next_states[self.state][action_index]
+            position = self._positions[state]
+            self.model.place_agent(position, self.actions[action_index])
+            reward = self._rewards[state]
+        else:
+            absorbing, reward = self.repeat_action(action_index)
+            state = self.state
+            position = self._positions[state]
+        self.trajectory.record(position)
+        self.episode_return += reward
+        return state, reward, \
+            self._absorbing[state] or self.trajectory.n_steps >= self.max_steps
+
+    def repeat_action(self, action_index) -> tuple:
+        state = self.state
+        direction = self.actions[action_index]
+        reward = 0.0
+        for i in range(self.action_repeat):
+            state = self._next_states[state][action_index]
+            self.model.place_agent(self._positions[state], direction)
+            reward += self._rewards[state]
+            if self._absorbing[state]:
+                break
+        self.state = state
+        return self._absorbing[state], reward
+
     def get_state(self):
         position = self.model.observation
         return position[0] * self.grid.shape[1] + position[1]
 
     def is_state_absorbing(self):
-        return self.reward != 0.0
+        return self._absorbing[self.state]
 
 
 class GRID66(GridEnvironment):
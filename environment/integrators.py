@@ -0,0 +1,37 @@
+def euler(derivatives, variables: tuple, dt: float, pairs: tuple) -> list:
+    """Explicit Euler - all of variables are advanced with derivatives at
+        the beginning of timestep."""
+    return [v + dt * d for v, d in zip(variables, derivatives(variables))]
+
+
+def semi_implicit(derivatives, variables: tuple, dt: float,
+                  pairs: tuple) -> list:
+    """Semi-implicit (symplectic) Euler - speeds are advanced first and
+        positions are advanced with new speeds."""
+    rates = derivatives(variables)
+    result = [v + dt * d for v, d in zip(variables, rates)]
+    for position, speed in pairs:
+        result[position] = variables[position] + dt * result[speed]
+    return result
+
+
+def rk4(derivatives, variables: tuple, dt: float, pairs: tuple) -> list:
+    """Classic 4th order Runge-Kutta method."""
+    k1 = derivatives(variables)
+    k2 = derivatives([v + dt / 2 * k for v, k in zip(variables, k1)])
+    k3 = derivatives([v + dt / 2 * k for v, k in zip(variables, k2)])
+    k4 = derivatives([v + dt * k for v, k in zip(variables, k3)])
+    return [
+        v + dt / 6 * (a + 2 * b + 2 * c + d)
+        for v, a, b, c, d in zip(variables, k1, k2, k3, k4)
+    ]
+
+
+# each of integrators advances variables by dt, given function returning
+# their derivatives and (position, speed) indices pairs of variables, in
+# which derivative of position is speed
+integrators = {
+    'euler': euler,
+    'semi_implicit': semi_implicit,
+    'rk4': rk4
+}
@@ -1,7 +1,9 @@
 import numpy as np
-from matplotlib import pyplot as plt
+from array import array
+from math import cos, floor, inf, sin, sqrt
 
 from ..abstract import Model
+from ..misc import pyplot
 
 
 g = 9.81
@@ -10,6 +12,7 @@ g = 9.81
 class Grid(Model):
     grid = np.zeros((10, 10))
     actions = ['up', 'right', 'down', 'left']
+    moves = {'up': (-1, 0), 'right': (0, 1), 'down': (1, 0), 'left': (0, -1)}
     walls_mark = None
 
     def __init__(self, init_agent_position=(0, 0), grid=None, walls_mark=None,
@@ -65,26 +68,29 @@ class Grid(Model):
         assert control in self.actions, \
             f"impossible move {control}, possible moves: {self.actions}"
         self.agent_direction = control
-        current_position = list(self.agent_position)
-        if control == "up":
-            current_position[0] -= 1
-        elif control == "right":
-            current_position[1] += 1
-        elif control == "down":
-            current_position[0] += 1
-        elif control == "left":
-            current_position[1] -= 1
+        move = self.moves[control]
         try:
-            self.agent_position = tuple(current_position)
+            self.agent_position = (self.agent_position[0] + move[0],
+                                   self.agent_position[1] + move[1])
         except ValueError:
             pass
         self.current_step += 1
         return self.observation
 
+    def place_agent(self, position: tuple, direction: str):
+        """Moves agent to position without checking if it's possible, for
+            environments which know transitions of grid in advance."""
+        self._agent_position = position
+        self.agent_direction = direction
+        self.current_step += 1
+
 
 class BallBeam(Model):
     """BallBeam - model of ball balancing on beam"""
+    __slots__ = ('init_ball_position', 'init_ball_speed', 'init_beam_theta',
+                 'beam_theta', 'variables', 'current_step')
     beam_length = 2
+    coordinates = ((0, 1),)
 
     def __init__(self, init_ball_position=0, init_ball_speed=0,
                  init_beam_theta=np.pi / 8, timestep=0.02,
@@ -93,11 +99,29 @@ class BallBeam(Model):
         self.init_ball_position = init_ball_position
         self.init_ball_speed = init_ball_speed
         self.init_beam_theta = init_beam_theta
+        # ball position and speed
+        self.variables = array('d', (0.0, 0.0))
         self.reset()
 
+    @property
+    def ball_position(self):
+        return self.variables[0]
+
+    @ball_position.setter
+    def ball_position(self, value):
+        self.variables[0] = value
+
+    @property
+    def ball_speed(self):
+        return self.variables[1]
+
+    @ball_speed.setter
+    def ball_speed(self, value):
+        self.variables[1] = value
+
     @property
     def observation(self):
-        return (self.ball_position, self.ball_speed)
+        return tuple(self.variables)
 
     def render(self):
         beam_x = [
@@ -114,6 +138,7 @@ class BallBeam(Model):
             self.ball_position * (- np.sin(self.beam_theta)) + ball_r
         )
         if not self.viewer:
+            plt = pyplot()
             self.viewer = plt.figure()
             self.viewer.ax = self.viewer.add_subplot(111)
             self.viewer.ax.axis('off')
@@ -140,44 +165,121 @@ class BallBeam(Model):
     def step(self, control=None):
         if control is not None:
             self.beam_theta = control
-        self.ball_position += self.timestep * self.ball_speed
-        self.ball_speed += self.timestep * g * np.sin(self.beam_theta)
+        if self.integrator != self.native_integrator:
+            self.integrate()
+            self.current_step += 1
+            return tuple(self.variables)
+        variables = self.variables
+        position, speed = variables
+        variables[0] = position + self.timestep * speed
+        variables[1] = speed + self.timestep * g * sin(self.beam_theta)
         self.current_step += 1
-        return self.observation
+        return tuple(variables)
+
+    def advance(self, control, n_steps: int, bound=inf) -> int:
+        """Advances model by n_steps timesteps at once, stopping at first
+            timestep after which absolute ball position is at least bound.
+            For fixed beam angle ball speed changes by the same value in
+            each of (Euler) steps, so position after n steps is quadratic
+            in n and is computed in closed form. Returns number of
+            timesteps made."""
+        if self.integrator != self.native_integrator:
+            for n in range(1, n_steps + 1):
+                self.step(control)
+                if abs(self.ball_position) >= bound:
+                    return n
+            return n_steps
+        if control is not None:
+            self.beam_theta = control
+        position, speed = self.variables
+        dt = self.timestep
+        dv = dt * g * sin(self.beam_theta)
+
+        def position_after(n):
+            return position + n * dt * speed + dt * dv * n * (n - 1) / 2
+
+        n = n_steps
+        if bound < inf:
+            # first n of |position_after(n)| >= bound is either 1 or first
+            # integer after one of roots of position_after(n) = +-bound
+            a, b = dt * dv / 2, dt * (speed - dv / 2)
+            candidates = [1]
+            for c in (position - bound, position + bound):
+                if a == 0.0:
+                    roots = [-c / b] if b != 0.0 else []
+                else:
+                    discriminant = b * b - 4 * a * c
+                    if discriminant < 0.0:
+                        continue
+                    roots = [(-b - sqrt(discriminant)) / (2 * a),
+                             (-b + sqrt(discriminant)) / (2 * a)]
+                for root in roots:
+                    if 0.0 <= root <= n_steps:
+                        candidates += [floor(root), floor(root) + 1]
+            crossings = [
+                m for m in candidates
+                if 1 <= m <= n_steps and abs(position_after(m)) >= bound
+            ]
+            if crossings:
+                n = min(crossings)
+        self.variables[0] = position_after(n)
+        self.variables[1] = speed + n * dv
+        self.current_step += n
+        return n
+
+    def derivatives(self, variables):
+        return (variables[1], g * sin(self.beam_theta))
 
 
 class MountainCar(Model):
-    """MountainCar - model of car climbing a hill (1990 Moore)"""
+    """MountainCar - model of car climbing a hill (1990 Moore). Its native
+        update advances speed first and position with the new speed, which
+        is semi-implicit Euler method with timestep 1, and clamps speed
+        before position is advanced. timestep is ignored by native update,
+        it's used only with other integrators (default 1, time unit of
+        native update), and then bounds are applied after both of
+        variables are advanced."""
+    __slots__ = ('init_car_position', 'init_car_speed',
+                 'init_car_acceleration', 'car_acceleration', 'variables',
+                 'current_step', 'integrated')
+    native_integrator = 'semi_implicit'
+    coordinates = ((0, 1),)
     hill_range = np.arange(-1.2, 0.6, 0.01)
     hill_line = np.diff(- 0.0025 * np.cos(3 * hill_range)) * 10000
     flag_r = 0.02
     flag_xy = (0.5, np.interp(0.5, hill_range[1::], hill_line))
 
     def __init__(self, init_car_position=-0.5, init_car_speed=0.0,
-                 init_car_acceleration=0.0, timestep=0.01, *args, **kwargs):
-        super().__init__(timestep, *args, **kwargs)
+                 init_car_acceleration=0.0, timestep=None, *args,
+                 integrator=None, **kwargs):
+        self.integrated = integrator not in (None, self.native_integrator)
+        if timestep is None:
+            timestep = 1.0 if self.integrated else 0.01
+        super().__init__(timestep, *args, integrator=integrator, **kwargs)
         self.init_car_position = init_car_position
         self.init_car_speed = init_car_speed
         self.init_car_acceleration = init_car_acceleration
+        # car position and speed
+        self.variables = array('d', (0.0, 0.0))
         self.reset()
 
     @property
     def car_position(self):
-        return self._car_position
+        return self.variables[0]
 
     @car_position.setter
     def car_position(self, value):
         if value < -1.2:
             value = -1.2
-            self.car_speed = 0
+            self.variables[1] = 0.0
         elif value > 0.5:
             value = 0.5
-            self.car_speed = 0
-        self._car_position = value
+            self.variables[1] = 0.0
+        self.variables[0] = value
 
     @property
     def car_speed(self):
-        return self._car_speed
+        return self.variables[1]
 
     @car_speed.setter
     def car_speed(self, value):
@@ -185,11 +287,11 @@ class MountainCar(Model):
             value = -0.07
         elif value > 0.07:
             value = 0.07
-        self._car_speed = value
+        self.variables[1] = value
 
     @property
     def observation(self):
-        return (self.car_position, self.car_speed)
+        return tuple(self.variables)
 
     def render(self):
         car_r = 0.02
@@ -200,6 +302,7 @@ class MountainCar(Model):
             ) + car_r
         )
         if not self.viewer:
+            plt = pyplot()
             self.viewer = plt.figure()
             self.viewer.ax = self.viewer.add_subplot(111)
             self.viewer.ax.axis('off')
@@ -225,19 +328,47 @@ class MountainCar(Model):
     def step(self, control=None):
         if control is not None:
             self.car_acceleration = control
-        self.car_speed += 0.001 * self.car_acceleration - 0.0025 * \
-            np.cos(3 * self.car_position)
-        self.car_position += self.car_speed
+        if self.integrated:
+            self.integrate()
+            self.current_step += 1
+            return tuple(self.variables)
+        variables = self.variables
+        position, speed = variables
+        # clamping of car_speed and car_position setters, inlined
+        speed += 0.001 * self.car_acceleration - 0.0025 * cos(3 * position)
+        if speed < -0.07:
+            speed = -0.07
+        elif speed > 0.07:
+            speed = 0.07
+        position += speed
+        if position < -1.2:
+            position, speed = -1.2, 0.0
+        elif position > 0.5:
+            position, speed = 0.5, 0.0
+        variables[0] = position
+        variables[1] = speed
         self.current_step += 1
-        return self.observation
+        return (position, speed)
+
+    def derivatives(self, variables):
+        return (variables[1],
+                0.001 * self.car_acceleration - 0.0025 * cos(3 * variables[0]))
+
+    def constrain(self, variables):
+        self.car_speed = variables[1]
+        self.car_position = variables[0]
 
 
 class CartPole(Model):
+    __slots__ = ('init_cart_position', 'init_cart_speed', 'init_pole_angle',
+                 'init_pole_speed', 'init_force', 'force', 'variables',
+                 'current_step')
     mc = 1.0
     m = 0.1
     mpc = mc + m
     l = 0.5
     track_length = 4.8
+    coordinates = ((0, 1), (2, 3))
     # for render function
     cart_size = (0.2, 0.08)
     bound_width = 0.2
@@ -251,30 +382,51 @@ class CartPole(Model):
         self.init_pole_angle = init_pole_angle
         self.init_pole_speed = init_pole_speed
         self.init_force = init_force
+        # cart position and speed, pole angle and speed
+        self.variables = array('d', (0.0, 0.0, 0.0, 0.0))
         self.reset()
 
     @property
     def cart_position(self):
-        return self._cart_position
+        return self.variables[0]
 
     @cart_position.setter
     def cart_position(self, value):
         if value <= -self.track_length / 2:
             value = -self.track_length / 2
-            self.cart_speed = 0
+            self.variables[1] = 0.0
         elif value >= self.track_length / 2:
             value = self.track_length / 2
-            self.cart_speed = 0
-        self._cart_position = value
+            self.variables[1] = 0.0
+        self.variables[0] = value
+
+    @property
+    def cart_speed(self):
+        return self.variables[1]
+
+    @cart_speed.setter
+    def cart_speed(self, value):
+        self.variables[1] = value
+
+    @property
+    def pole_angle(self):
+        return self.variables[2]
+
+    @pole_angle.setter
+    def pole_angle(self, value):
+        self.variables[2] = value
+
+    @property
+    def pole_speed(self):
+        return self.variables[3]
+
+    @pole_speed.setter
+    def pole_speed(self, value):
+        self.variables[3] = value
 
     @property
     def observation(self):
-        return (
-            self.cart_position,
-            self.cart_speed,
-            self.pole_angle,
-            self.pole_speed
-        )
+        return tuple(self.variables)
 
     def render(self):
         pole_x = [self.cart_position,
@@ -282,6 +434,7 @@ class CartPole(Model):
         pole_y = [0 + self.cart_size[1],
                   self.l * 2 * np.cos(self.pole_angle) + self.cart_size[1]]
         if not self.viewer:
+            plt = pyplot()
             self.viewer = plt.figure()
             self.viewer.ax = self.viewer.add_subplot(111)
             self.viewer.ax.axis('off')
@@ -292,7 +445,7 @@ class CartPole(Model):
                 [0, 0],
                 linewidth=3, color='black'
             )
-            self.track_center_mark, = self.viewer.ax.plot(
+            self.viewer.track_center_mark, = self.viewer.ax.plot(
                 [0, 0], [-0.05, 0.05], color='green'
             )
             self.viewer.track_left_bound = plt.Rectangle(
@@ -334,22 +487,51 @@ class CartPole(Model):
     def step(self, control=None):
         if control is not None:
             self.force = control
-        theta = [self.pole_angle, self.pole_speed, 0]
-        x = [self.cart_position, self.cart_speed, 0]
-
-        theta2nominator = g * np.sin(theta[0]) + np.cos(theta[0]) * \
-            (-self.force - self.m * self.l * theta[1] ** 2 * np.sin(theta[0])) / self.mpc
+        if self.integrator != self.native_integrator:
+            self.integrate()
+            self.current_step += 1
+            return tuple(self.variables)
+        variables = self.variables
+        position, speed, angle, angular_speed = variables
+        sin_angle, cos_angle = sin(angle), cos(angle)
+
+        theta2nominator = g * sin_angle + cos_angle * \
+            (-self.force - self.m * self.l * angular_speed ** 2 * sin_angle) \
+            / self.mpc
         theta2denominator = self.l * \
-            (4 / 3 - (self.m * np.cos(theta[0]) ** 2) / self.mpc)
-        theta[2] = theta2nominator / theta2denominator
+            (4 / 3 - (self.m * cos_angle ** 2) / self.mpc)
+        angular_acceleration = theta2nominator / theta2denominator
 
-        x[2] = (self.force + self.m * self.l * (
-            theta[1] ** 2 * np.sin(theta[0]) - theta[2] * np.cos(theta[0])
+        acceleration = (self.force + self.m * self.l * (
+            angular_speed ** 2 * sin_angle - angular_acceleration * cos_angle
         )) / self.mpc
 
-        self.pole_angle += theta[1] * self.timestep
-        self.pole_speed += theta[2] * self.timestep
-        self.cart_position += x[1] * self.timestep
-        self.cart_speed += x[2] * self.timestep
+        variables[2] = angle + angular_speed * self.timestep
+        variables[3] = angular_speed + angular_acceleration * self.timestep
+        # clamping of cart_position setter, inlined
+        position += speed * self.timestep
+        bound = self.track_length / 2
+        if position <= -bound:
+            position, speed = -bound, 0.0
+        elif position >= bound:
+            position, speed = bound, 0.0
+        variables[0] = position
+        variables[1] = speed + acceleration * self.timestep
         self.current_step += 1
-        return self.observation
+        return tuple(variables)
+
+    def derivatives(self, variables):
+        position, speed, angle, angular_speed = variables
+        sin_angle, cos_angle = sin(angle), cos(angle)
+        angular_acceleration = (
+            g * sin_angle + cos_angle * (
+                -self.force - self.m * self.l * angular_speed ** 2 * sin_angle
+            ) / self.mpc
+        ) / (self.l * (4 / 3 - (self.m * cos_angle ** 2) / self.mpc))
+        acceleration = (self.force + self.m * self.l * (
+            angular_speed ** 2 * sin_angle - angular_acceleration * cos_angle
+        )) / self.mpc
+        return (speed, acceleration, angular_speed, angular_acceleration)
+
+    def constrain(self, variables):
+        self.cart_position = variables[0]
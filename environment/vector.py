@@ -0,0 +1,159 @@
+import numpy as np
+from abc import ABC, abstractmethod
+
+from . import continuous
+from .models import g
+
+
+__all__ = ['VectorBallBeam', 'VectorMountainCar', 'VectorCartPole']
+
+
+class VectorEnvironment(ABC):
+    """VectorEnvironment - N copies of continuous environment stepped at once.
+        State of all of copies is kept in (N, n_state_variables) array, so
+        each physics equation is a single array expression. Copies which
+        finish their episodes are reset automatically."""
+    environment = None
+
+    def __init__(self, n_environments: int, max_steps=None, *args,
+                 action_repeat=1, **kwargs):
+        if n_environments <= 0:
+            raise ValueError("number of environments must be positive")
+        if action_repeat != 1:
+            raise ValueError("vector environments advance models by single"
+                             + " timestep, action_repeat must be 1")
+        self.n_environments = n_environments
+        self.model = self.environment.model(*args, **kwargs)
+        if self.model.integrator != self.model.native_integrator:
+            raise ValueError("vector environments advance models with"
+                             + f" {self.model.native_integrator} integrator"
+                             + " only")
+        self.actions = np.array(self.environment.actions)
+        self.max_steps = max_steps or self.environment.max_steps
+        self.initial_observation = np.array(self.model.observation,
+                                             dtype=float)
+        self.observations = np.empty(
+            (n_environments, self.initial_observation.size)
+        )
+        self.steps = np.zeros(n_environments, dtype=int)
+        self.terminal_observations = self.observations.copy()
+        self.reset()
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @abstractmethod
+    def advance(self, action_indices):
+        """Advances all models by one timestep in place."""
+
+    @abstractmethod
+    def is_state_absorbing(self):
+        pass
+
+    @abstractmethod
+    def get_rewards(self, absorbing):
+        pass
+
+    @property
+    def rewards(self):
+        return self.get_rewards(self.is_state_absorbing())
+
+    @property
+    def done(self):
+        return self.is_state_absorbing() | (self.steps >= self.max_steps)
+
+    def reset(self, mask=None):
+        if mask is None:
+            mask = slice(None)
+        self.observations[mask] = self.initial_observation
+        self.steps[mask] = 0
+        return self.observations
+
+    def step(self, action_indices):
+        """Does actions in all of environments, returns observations,
+            rewards and done flags. Observations of finished environments
+            are stored in terminal_observations and replaced with initial
+            observation. Returned observations array is updated in place by
+            next steps."""
+        self.advance(np.asarray(action_indices))
+        self.steps += 1
+        absorbing = self.is_state_absorbing()
+        rewards = self.get_rewards(absorbing)
+        dones = absorbing | (self.steps >= self.max_steps)
+        if dones.any():
+            self.terminal_observations[dones] = self.observations[dones]
+            self.reset(dones)
+        return self.observations, rewards, dones
+
+
+class VectorBallBeam(VectorEnvironment):
+    environment = continuous.BallBeam
+
+    def __init__(self, n_environments: int, max_steps=None, *args, **kwargs):
+        super().__init__(n_environments, max_steps, *args, **kwargs)
+        self.speed_changes = self.model.timestep * g * np.sin(self.actions)
+
+    def advance(self, action_indices):
+        ball_position, ball_speed = self.observations.T
+        ball_position += self.model.timestep * ball_speed
+        ball_speed += self.speed_changes[action_indices]
+
+    def is_state_absorbing(self):
+        return np.abs(self.observations[:, 0]) >= self.model.beam_length / 2
+
+    def get_rewards(self, absorbing):
+        return np.where(absorbing, -1.0, 0.0)
+
+
+class VectorMountainCar(VectorEnvironment):
+    environment = continuous.MountainCar
+
+    def advance(self, action_indices):
+        car_position, car_speed = self.observations.T
+        car_speed += 0.001 * self.actions[action_indices] - 0.0025 * \
+            np.cos(3 * car_position)
+        np.clip(car_speed, -0.07, 0.07, out=car_speed)
+        car_position += car_speed
+        car_speed[(car_position < -1.2) | (car_position > 0.5)] = 0.0
+        np.clip(car_position, -1.2, 0.5, out=car_position)
+
+    def is_state_absorbing(self):
+        return self.observations[:, 0] == 0.5
+
+    def get_rewards(self, absorbing):
+        return np.where(absorbing, 1.0, 0.0)
+
+
+class VectorCartPole(VectorEnvironment):
+    environment = continuous.CartPole
+
+    def advance(self, action_indices):
+        m = self.model
+        force = self.actions[action_indices]
+        cart_position, cart_speed, pole_angle, pole_speed = \
+            self.observations.T
+        sin, cos = np.sin(pole_angle), np.cos(pole_angle)
+
+        theta2nominator = g * sin + cos * \
+            (-force - m.m * m.l * pole_speed ** 2 * sin) / m.mpc
+        theta2denominator = m.l * (4 / 3 - (m.m * cos ** 2) / m.mpc)
+        pole_acceleration = theta2nominator / theta2denominator
+
+        cart_acceleration = (force + m.m * m.l * (
+            pole_speed ** 2 * sin - pole_acceleration * cos
+        )) / m.mpc
+
+        pole_angle += pole_speed * m.timestep
+        pole_speed += pole_acceleration * m.timestep
+        cart_position += cart_speed * m.timestep
+        bound = m.track_length / 2
+        cart_speed[(cart_position <= -bound) | (cart_position >= bound)] = 0.0
+        np.clip(cart_position, -bound, bound, out=cart_position)
+        cart_speed += cart_acceleration * m.timestep
+
+    def is_state_absorbing(self):
+        return np.abs(self.observations[:, 2]) > (12.0 / 180 * np.pi)
+
+    def get_rewards(self, absorbing):
+        return np.where(absorbing, -1.0, 0.0)
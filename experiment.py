@@ -0,0 +1,177 @@
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing.shared_memory import SharedMemory
+
+
+def learning_curves_buffer(shared_memory: SharedMemory, shape: tuple):
+    return np.ndarray(shape, dtype=float, buffer=shared_memory.buf)
+
+
+def run_repeat(task: tuple):
+    """Trains one fresh algorithm instance and writes its steps per episode
+        into row of learning curves array kept in shared memory."""
+    (shm_name, shape, row, seed_sequence, algorithm, environment,
+     approximator, approximator_params, params, n_episodes) = task
+    env = environment()
+    if approximator is not None:
+        env.approximate_with(approximator, **(approximator_params or {}))
+    alg = algorithm(env, **{**(params or {}), 'seed': seed_sequence})
+    alg.learn(n_episodes, print_status=False)
+    shared_memory = SharedMemory(shm_name)
+    try:
+        learning_curves = learning_curves_buffer(shared_memory, shape)
+        learning_curves[row, :alg.episodes] = alg.steps_per_episode
+        del learning_curves
+    finally:
+        shared_memory.close()
+    return row
+
+
+def run_experiment(algorithm, environment, approximator=None,
+                   approximator_params: dict = None, params: dict = None,
+                   n_episodes=1, n_repeats=1, n_workers=None,
+                   seed=None) -> np.ndarray:
+    """Runs n_repeats independent learnings of algorithm (class) with given
+        params in environments created by environment factory (environment
+        class or other picklable callable), optionally approximated with
+        approximator class. Repeats are spread over pool of n_workers
+        processes (all of cpus by default), each seeded with its own child
+        of seed sequence, so results depend only on seed. Returns
+        (n_repeats, n_episodes) learning curves array, which can be passed
+        to plot_learning_stats and compare_learning_curves."""
+    if n_episodes <= 0 or n_repeats <= 0:
+        raise ValueError("number of episodes and repeats must be positive")
+    if params and 'seed' in params:
+        raise ValueError("repeats are seeded with seed argument, seed can't" +
+                         " be given in params")
+    shape = (n_repeats, n_episodes)
+    seed_sequences = np.random.SeedSequence(seed).spawn(n_repeats)
+    n_workers = min(n_workers or os.cpu_count() or 1, n_repeats)
+    shared_memory = SharedMemory(create=True,
+                                 size=n_repeats * n_episodes * 8)
+    try:
+        learning_curves = learning_curves_buffer(shared_memory, shape)
+        learning_curves[:] = np.nan
+        tasks = [
+            (shared_memory.name, shape, row, seed_sequences[row], algorithm,
+             environment, approximator, approximator_params, params,
+             n_episodes)
+            for row in range(n_repeats)
+        ]
+        if n_workers == 1:
+            for task in tasks:
+                run_repeat(task)
+        else:
+            with ProcessPoolExecutor(n_workers) as executor:
+                list(executor.map(run_repeat, tasks))
+        result = learning_curves.copy()
+        del learning_curves
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+    return result
+
+
+def continue_learning(task: tuple):
+    """Continues learning of algorithm instance for n_episodes episodes and
+        returns it."""
+    alg, n_episodes = task
+    alg.learn(n_episodes, print_status=False)
+    return alg
+
+
+def config_label(config: dict) -> str:
+    return ', '.join(f"{name}={value}" for name, value in config.items())
+
+
+def successive_halving(algorithm, environment, param_grid: dict,
+                       approximator=None, approximator_params: dict = None,
+                       params: dict = None, n_episodes=1, n_repeats=1,
+                       min_episodes=1, eta=3, goal='min', window_size=5,
+                       n_workers=None, seed=None) -> dict:
+    """Sweeps over all of combinations of param_grid (dict of lists of
+        values) merged with params, using successive halving: all configs
+        learn min_episodes episodes, then only best 1/eta of them continue
+        learning eta times more episodes and so on, up to n_episodes.
+        Configs are ranked by median over repeats of mean steps per episode
+        in last window_size episodes, which should be minimized (goal 'min',
+        e.g. for grid environments) or maximized (goal 'max', e.g. for
+        balancing environments). Returns dict of learning curves arrays
+        (n_repeats, n_episodes) labeled by params of config, ordered from
+        best config. Episodes not learned by pruned configs are NaN."""
+    if goal not in ('min', 'max'):
+        raise ValueError(f"goal must be 'min' or 'max', given {goal!r}")
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    if n_episodes <= 0 or n_repeats <= 0 or min_episodes <= 0:
+        raise ValueError("number of episodes and repeats must be positive")
+    configs = [
+        dict(zip(param_grid, values))
+        for values in product(*param_grid.values())
+    ]
+    seed_sequences = np.random.SeedSequence(seed).spawn(
+        len(configs) * n_repeats
+    )
+    instances = []
+    for i, config in enumerate(configs):
+        for j in range(n_repeats):
+            env = environment()
+            if approximator is not None:
+                env.approximate_with(approximator,
+                                     **(approximator_params or {}))
+            instances.append(algorithm(env, **{
+                'seed': seed_sequences[i * n_repeats + j],
+                **(params or {}),
+                **config
+            }))
+    n_workers = n_workers or os.cpu_count() or 1
+
+    survivors = list(range(len(configs)))
+    ranking = []
+    episodes = min(min_episodes, n_episodes)
+    while True:
+        rows = [
+            k for i in survivors
+            for k in range(i * n_repeats, (i + 1) * n_repeats)
+        ]
+        tasks = [
+            (instances[k], episodes - instances[k].episodes) for k in rows
+        ]
+        if min(n_workers, len(tasks)) == 1:
+            results = map(continue_learning, tasks)
+        else:
+            with ProcessPoolExecutor(min(n_workers, len(tasks))) as executor:
+                results = list(executor.map(continue_learning, tasks))
+        for k, instance in zip(rows, results):
+            instances[k] = instance
+
+        scores = [
+            np.median([
+                np.mean(instances[k].steps_per_episode[-window_size:])
+                for k in range(i * n_repeats, (i + 1) * n_repeats)
+            ])
+            for i in survivors
+        ]
+        order = np.argsort(scores, kind='stable')
+        if goal == 'max':
+            order = order[::-1]
+        survivors = [survivors[i] for i in order]
+        if episodes >= n_episodes:
+            break
+        n_survivors = max(1, len(survivors) // eta)
+        ranking = survivors[n_survivors:] + ranking
+        survivors = survivors[:n_survivors]
+        episodes = n_episodes if n_survivors == 1 \
+            else min(episodes * eta, n_episodes)
+    ranking = survivors + ranking
+
+    learning_curves = {}
+    for i in ranking:
+        curves = np.full((n_repeats, n_episodes), np.nan)
+        for j in range(n_repeats):
+            steps = instances[i * n_repeats + j].steps_per_episode
+            curves[j, :len(steps)] = steps
+        learning_curves[config_label(configs[i])] = curves
+    return learning_curves
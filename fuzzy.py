@@ -4,6 +4,12 @@ import numpy as np
 
 class MembershipFunction(ABC):
 
+    @property
+    def breakpoints(self) -> tuple:
+        """(a, b, c, d) points of piecewise linear membership function or
+            None, if function is not piecewise linear."""
+        return None
+
     @abstractmethod
     def membership_grade(self, x):
         pass
@@ -22,6 +28,10 @@ class TriangularMembershipFunction(MembershipFunction):
         self.b = b
         self.c = c
 
+    @property
+    def breakpoints(self) -> tuple:
+        return (self.a, self.b, self.b, self.c)
+
     def membership_grade(self, x: float) -> float:
         if self.a <= x <= self.b:
             try:
@@ -52,6 +62,10 @@ class TrapezoidalMembershipFunction(MembershipFunction):
         self.c = c
         self.d = d
 
+    @property
+    def breakpoints(self) -> tuple:
+        return (self.a, self.b, self.c, self.d)
+
     def membership_grade(self, x: float) -> float:
         if self.a <= x <= self.b:
             try:
@@ -87,7 +101,30 @@ def create_membership_function_from_range_tuple(range_tuple: tuple):
                          f" {len(range_tuple)} range values, must be 3 or 4")
 
 
+def membership_grades(x, slopes):
+    """Computes grades of piecewise linear membership functions given by
+        slopes array, broadcasting x against them. Slopes array consists
+        of (left, right) points and (left_width, -right_width) widths of
+        rising and falling slopes of functions. Degenerate (zero width)
+        slopes are vertical edges: rising one is open (grade 0 at its
+        point) and falling one is closed (grade 1 at its point)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        grades = np.subtract(x[..., np.newaxis], slopes[0])
+        grades /= slopes[1]
+    # x on degenerate edge gives 0 / 0, which is replaced with grade 0 for
+    # rising edge and ignored (falling edge doesn't limit grade) by fmax
+    # and fmin
+    rising = np.fmax(grades[..., 0], 0.0)
+    grades = np.fmin(rising, grades[..., 1], out=rising)
+    return np.clip(grades, 0.0, 1.0, out=grades)
+
+
 class FuzzySet:
+    """FuzzySet - set of membership functions. Breakpoints of piecewise
+        linear membership functions are kept in (n, 4) array, so grades of
+        all of them are computed in one broadcasted expression."""
+    # replacement of infinite breakpoints
+    huge = 1e300
 
     def __init__(self, membership_functions: list):
         self.membership_functions = membership_functions
@@ -103,6 +140,28 @@ class FuzzySet:
                 raise TypeError("all elements of 'membership_functions' " +
                                 "param must be MembershipFunction instances")
         self._membership_functions = value
+        breakpoints = [mf.breakpoints for mf in value]
+        if any(bp is None for bp in breakpoints):
+            self.breakpoints = self.slopes = None
+        else:
+            self.breakpoints = np.array(breakpoints, dtype=float).reshape(-1, 4)
+            self._compile_slopes()
+
+    def _compile_slopes(self):
+        """Grade is computed as min(rising, falling) clipped to [0, 1],
+            where rising = (x - left) / left_width and falling =
+            (right - x) / right_width. Infinite slopes get replaced so that
+            grades are equal to ones given by membership_grade of each
+            function, degenerate slopes keep zero widths."""
+        a, b, c, d = self.breakpoints.T
+        with np.errstate(invalid='ignore'):
+            self.slopes = np.stack([np.stack([
+                np.where(np.isinf(a), -self.huge, a),
+                np.where(np.isinf(d), self.huge, d)
+            ], axis=-1), np.stack([
+                np.where(np.isinf(a), 1.0, b - a),
+                -np.where(np.isinf(d), 1.0, d - c)
+            ], axis=-1)])
 
     @classmethod
     def from_membership_functions_ranges(cls,
@@ -112,10 +171,17 @@ class FuzzySet:
             for mfr in membership_functions_ranges
         ])
 
-    def membership_grades(self, x: float):
-        return np.array([
-            mf.membership_grade(x) for mf in self.membership_functions
-        ])
+    def membership_grades(self, x):
+        """Returns grades of all membership functions for value x, or
+            (N, n) array of grades for array of N values."""
+        if self.breakpoints is None:
+            if np.ndim(x) > 0:
+                return np.array([self.membership_grades(v) for v in x])
+            return np.array([
+                mf.membership_grade(x) for mf in self.membership_functions
+            ])
+        return membership_grades(np.asarray(x, dtype=float)[..., np.newaxis],
+                                 self.slopes)
 
     def __str__(self):
         return self.__class__.__name__ + "(" + \
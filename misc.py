@@ -1,8 +1,79 @@
 import numpy as np
 import os
+import sys
 from itertools import islice
-from matplotlib import pyplot as plt
-from matplotlib.ticker import ScalarFormatter, MultipleLocator
+
+
+def is_headless() -> bool:
+    "Returns True if there is no display to show figures on"
+    if not sys.platform.startswith('linux'):
+        return False
+    return not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def pyplot():
+    """Returns matplotlib.pyplot, which is imported on first call instead of
+        import of rltoolbox, so headless learning doesn't pay for it. Agg
+        backend is forced when there is no display and no backend is chosen
+        with MPLBACKEND environment variable."""
+    if 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+        if is_headless() and 'MPLBACKEND' not in os.environ:
+            matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    return plt
+
+
+class RandomStream:
+    """RandomStream - seeded numpy random Generator which uniform numbers and
+        random actions are drawn in blocks, so getting each of them costs
+        only pop from list instead of call of random number generator."""
+
+    def __init__(self, n_actions: int, seed=None, block_size=1024):
+        self.generator = np.random.default_rng(seed)
+        self.n_actions = n_actions
+        self.block_size = block_size
+        self._uniforms = []
+        self._actions = []
+
+    def uniform(self) -> float:
+        "Returns random float from [0.0, 1.0)"
+        try:
+            return self._uniforms.pop()
+        except IndexError:
+            self._uniforms = self.generator.random(self.block_size).tolist()
+            return self._uniforms.pop()
+
+    def action(self) -> int:
+        "Returns random action index"
+        try:
+            return self._actions.pop()
+        except IndexError:
+            self._actions = self.generator.integers(
+                self.n_actions, size=self.block_size
+            ).tolist()
+            return self._actions.pop()
+
+    @property
+    def state(self) -> dict:
+        "JSON serializable state of generator and of buffered numbers"
+        return {
+            'bit_generator': self.generator.bit_generator.state,
+            'uniforms': self._uniforms,
+            'actions': self._actions
+        }
+
+    @state.setter
+    def state(self, value: dict):
+        self.generator.bit_generator.state = value['bit_generator']
+        self._uniforms = list(value['uniforms'])
+        self._actions = list(value['actions'])
+
+    def choice(self, seq):
+        "Returns random element of non-empty sequence"
+        if len(seq) == 1:
+            return seq[0]
+        return seq[int(self.uniform() * len(seq))]
 
 
 def window(seq, n=2):
@@ -18,6 +89,7 @@ def window(seq, n=2):
 
 def plot_learning_stats(learning_history, title: str, grid=True, log_scale=False,
                         figsize=(10, 8), show=True, *args, **kwargs):
+    plt = pyplot()
     fig, ax = plt.subplots(figsize=figsize, dpi=100)
     ax.set_title(title)
     if grid:
@@ -44,6 +116,7 @@ def plot_learning_stats(learning_history, title: str, grid=True, log_scale=False
 def compare_learning_curves(named_learning_histories: dict, title: str, log_scale=False,
                             grid=True, figsize=(10, 8), show=True,
                             *args, **kwargs):
+    plt = pyplot()
     fig, ax = plt.subplots(figsize=figsize, dpi=100)
     ax.set_title(title)
     if grid:
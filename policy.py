@@ -0,0 +1,150 @@
+import numpy as np
+from bisect import bisect_right
+from itertools import product
+
+from .algorithm.abstract import ClassicAlgorithm
+from .environment.grid import GridEnvironment
+
+
+def compile_lookup(edges: list, strides: list, table: list):
+    """Returns function mapping observation to element of flat table, with
+        bisections of variables having any edges unrolled for up to 4 of
+        such variables."""
+    used = [i for i, e in enumerate(edges) if e]
+    e = [edges[i] for i in used]
+    s = [strides[i] for i in used]
+    if len(used) == 0:
+        return lambda observation: table[0]
+    if len(used) == 1:
+        i0, = used
+        return lambda o: table[s[0] * bisect_right(e[0], o[i0])]
+    if len(used) == 2:
+        i0, i1 = used
+        return lambda o: table[s[0] * bisect_right(e[0], o[i0])
+                               + s[1] * bisect_right(e[1], o[i1])]
+    if len(used) == 3:
+        i0, i1, i2 = used
+        return lambda o: table[s[0] * bisect_right(e[0], o[i0])
+                               + s[1] * bisect_right(e[1], o[i1])
+                               + s[2] * bisect_right(e[2], o[i2])]
+    if len(used) == 4:
+        i0, i1, i2, i3 = used
+        return lambda o: table[s[0] * bisect_right(e[0], o[i0])
+                               + s[1] * bisect_right(e[1], o[i1])
+                               + s[2] * bisect_right(e[2], o[i2])
+                               + s[3] * bisect_right(e[3], o[i3])]
+
+    def lookup(observation):
+        state = 0
+        for i, edges, stride in zip(used, e, s):
+            state += stride * bisect_right(edges, observation[i])
+        return table[state]
+    return lookup
+
+
+class Policy:
+    """Policy - greedy policy compiled to int8 table of actions indices,
+        indexed by cell of observation. Cell of each observation variable is
+        found by bisection of its sorted edges, so choosing action doesn't
+        need algorithm, environment nor approximator."""
+    __slots__ = ('edges', 'table', '_strides', '_lookup')
+
+    def __init__(self, edges: list, table: np.ndarray):
+        self.edges = [np.asarray(e, dtype=float) for e in edges]
+        shape = tuple(len(e) + 1 for e in self.edges)
+        if table.size != int(np.prod(shape)):
+            raise ValueError(f"table of {table.size} actions doesn't match" +
+                             f" cells of shape {shape}")
+        if table.size and (table.min() < 0 or table.max() > 127):
+            raise ValueError("actions indices must fit into int8")
+        self.table = table.astype(np.int8).reshape(shape)
+        self._strides = [
+            int(np.prod(shape[i + 1:])) for i in range(len(shape))
+        ]
+        # lists are indexed and bisected faster than arrays
+        self._lookup = compile_lookup([e.tolist() for e in self.edges],
+                                      self._strides,
+                                      self.table.ravel().tolist())
+
+    def __call__(self, observation) -> int:
+        return self._lookup(observation)
+
+    def __getstate__(self):
+        return self.edges, self.table
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def actions(self, observations) -> np.ndarray:
+        """Returns actions indices for (N, n_variables) observations."""
+        observations = np.asarray(observations, dtype=float)
+        states = np.zeros(len(observations), dtype=np.intp)
+        for i, (edges, stride) in enumerate(zip(self.edges, self._strides)):
+            states += stride * np.searchsorted(edges, observations[:, i],
+                                               side='right')
+        return self.table.ravel()[states]
+
+
+def export_table_policy(algorithm) -> Policy:
+    """Compiles greedy policy of classic algorithm (Q, SARSA, R or AHC)
+        learning in grid or table approximated environment. Ties are
+        broken towards lower action index."""
+    if not isinstance(algorithm, ClassicAlgorithm):
+        raise TypeError(f"table policy can be exported only from classic" +
+                        f" algorithm, given {algorithm.__class__.__name__}")
+    environment = algorithm.environment
+    if isinstance(environment, GridEnvironment):
+        edges = [np.arange(1, n) for n in environment.grid.shape]
+        n_states = environment.grid.size
+    else:
+        edges = [sorted(rang) for rang in
+                 environment.approximator.state_variables_ranges]
+        n_states = len(environment.approximator.possible_states)
+    table = algorithm.greedy_actions(np.arange(n_states), random_ties=False)
+    return Policy(edges, table)
+
+
+def export_grid_policy(algorithm, resolution=20, bounds: list = None) -> Policy:
+    """Compiles greedy policy of any algorithm learning in approximated
+        environment (e.g. CMAC or fuzzy) into dense grid of resolution cells
+        per observation variable, with action chosen at center of each cell.
+        Grid spans given (low, high) bounds of each variable, by default
+        state variables ranges extended by one range spacing on each side.
+        Variables without ranges get single cell. Ties are broken towards
+        lower action index."""
+    environment = algorithm.environment
+    if environment.approximator is None:
+        raise TypeError("grid policy can be exported only from algorithm" +
+                        " learning in approximated environment")
+    ranges = environment.approximator.state_variables_ranges
+    if bounds is None:
+        bounds = []
+        for rang in ranges:
+            if len(rang) == 0:
+                bounds.append(None)
+                continue
+            low, high = min(rang), max(rang)
+            spacing = (high - low) / (len(rang) - 1) if len(rang) > 1 else 1.0
+            bounds.append((low - spacing, high + spacing))
+    edges, centers = [], []
+    for bound in bounds:
+        if bound is None:
+            edges.append([])
+            centers.append([0.0])
+            continue
+        points = np.linspace(bound[0], bound[1], resolution + 1)
+        edges.append(points[1:-1])
+        centers.append((points[1:] + points[:-1]) / 2)
+    observations = np.array(list(product(*centers)))
+    table = algorithm.greedy_actions(
+        environment.approximator.approximate_states(observations),
+        random_ties=False
+    )
+    return Policy(edges, table)
+
+
+def export_policy(algorithm, *args, **kwargs) -> Policy:
+    """Exports table policy of classic algorithm, grid policy otherwise."""
+    if isinstance(algorithm, ClassicAlgorithm):
+        return export_table_policy(algorithm)
+    return export_grid_policy(algorithm, *args, **kwargs)
@@ -0,0 +1,134 @@
+import cProfile
+import time
+
+PHASES = ('environment', 'approximation', 'selection', 'render', 'other')
+
+
+class Profiler:
+    """Profiler - measures per-phase wall-clock time and number of calls in
+        learning episodes. Phases are environment step (model step with reward
+        and trajectory recording, without state approximation - models are
+        slotted, so their steps can't be wrapped separately), state
+        approximation, greedy action selection, render and other, which is the
+        rest of episode time (TD update, exploration, loop), counted once per
+        step. Wrappers timing phases are installed on algorithm, environment
+        and approximator instances only for duration of episode, so algorithms
+        learning without profiler run unchanged code. If stats_path is given,
+        episodes are also profiled with cProfile and stats of each window of
+        stats_every episodes are dumped to stats_path.<first>-<last>.prof file
+        (readable with pstats). Stats of unfinished window can be dumped with
+        dump_stats."""
+
+    def __init__(self, stats_path: str = None, stats_every=1):
+        if stats_every < 1:
+            raise ValueError("stats_every must be positive")
+        self.stats_path = stats_path
+        self.stats_every = stats_every
+        self.episodes = []
+        self._wrapped = []
+        self._profile = None
+        self._window_start = None
+        self._window_episodes = 0
+
+    def reset_counters(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self._children = 0.0
+
+    def timed(self, phase: str, function):
+        """Returns function adding its exclusive time (without time of
+            timed functions it calls) to given phase."""
+        def wrapper(*args, **kwargs):
+            outer_children = self._children
+            self._children = 0.0
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.times[phase] += elapsed - self._children
+                self.calls[phase] += 1
+                self._children = outer_children + elapsed
+        return wrapper
+
+    def wrap(self, obj, name: str, phase: str):
+        original = getattr(obj, name)
+        self._wrapped.append((obj, name, original, name in vars(obj)))
+        setattr(obj, name, self.timed(phase, original))
+
+    def unwrap(self):
+        for obj, name, original, had_attribute in reversed(self._wrapped):
+            if had_attribute:
+                setattr(obj, name, original)
+            else:
+                delattr(obj, name)
+        self._wrapped = []
+
+    def start_episode(self, algorithm):
+        self.reset_counters()
+        environment = algorithm.environment
+        self.wrap(environment, 'step', 'environment')
+        if environment.approximator is not None:
+            self.wrap(environment.approximator, 'approximate_state',
+                      'approximation')
+        self.wrap(algorithm, 'greedy_action', 'selection')
+        self.wrap(environment, 'render', 'render')
+        self._episode = algorithm.episodes + 1
+        if self.stats_path is not None:
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+                self._window_start = self._episode
+            self._profile.enable()
+        self._start = time.perf_counter()
+
+    def end_episode(self, algorithm) -> dict:
+        """Finishes measurement of episode and returns its report: dict of
+            phases times and calls, total time and number of steps."""
+        total = time.perf_counter() - self._start
+        if self._profile is not None:
+            self._profile.disable()
+        self.unwrap()
+        self.times['other'] = total - self._children
+        self.calls['other'] = algorithm.environment.steps
+        report = {
+            'episode': self._episode,
+            'steps': algorithm.environment.steps,
+            'total': total,
+            'times': self.times,
+            'calls': self.calls
+        }
+        self.episodes.append(report)
+        if self._profile is not None:
+            self._window_episodes += 1
+            self._window_end = self._episode
+            if self._window_episodes >= self.stats_every:
+                self.dump_stats()
+        return report
+
+    def dump_stats(self):
+        "Dumps stats of episodes profiled since last dump, if there are any"
+        if self._profile is None:
+            return
+        self._profile.dump_stats(f"{self.stats_path}.{self._window_start}-" +
+                                 f"{self._window_end}.prof")
+        self._profile = None
+        self._window_episodes = 0
+
+    def summary(self) -> dict:
+        """Returns phases times and calls summed over all of episodes."""
+        times = dict.fromkeys(PHASES, 0.0)
+        calls = dict.fromkeys(PHASES, 0)
+        for report in self.episodes:
+            for phase in PHASES:
+                times[phase] += report['times'][phase]
+                calls[phase] += report['calls'][phase]
+        return {'times': times, 'calls': calls}
+
+    @staticmethod
+    def format(report: dict) -> str:
+        total = sum(report['times'].values()) or 1.0
+        return "  ".join(
+            f"{phase}: {report['times'][phase] * 1e3:.1f}ms" +
+            f" ({report['times'][phase] / total:.0%})"
+            for phase in PHASES if report['calls'][phase]
+        )
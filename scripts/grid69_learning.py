@@ -1,8 +1,7 @@
 #!/usr/bin/env python
-import numpy as np
-
 from rltoolbox.algorithm.classic import *
 from rltoolbox.environment.grid import GRID69
+from rltoolbox.experiment import run_experiment
 from rltoolbox.misc import compare_learning_curves
 
 
@@ -25,11 +24,9 @@ if __name__ == "__main__":
     histories = {}
 
     for alg in algorithms:
-        learning_curves = np.zeros((n_repeats, n_episodes))
-        for i in range(n_repeats):
-            alg_instance = alg[0](environment(), **alg[1])
-            alg_instance.learn(n_episodes)
-            learning_curves[i, :] = alg_instance.steps_per_episode
-        histories[alg_instance.name] = learning_curves
+        histories[alg[0].label(alg[1]['lambd'])] = run_experiment(
+            alg[0], environment, params=alg[1], n_episodes=n_episodes,
+            n_repeats=n_repeats
+        )
     
     compare_learning_curves(histories, 'GRID69 learning')
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from rltoolbox.tests.fakes import FakeAlgorithm, FakeContinuousEnvironment
@@ -21,7 +22,7 @@ def test_init_algorithm():
 def test_algorithm_name(lambd, name):
     env = FakeContinuousEnvironment()
     alg = FakeAlgorithm(env, lambd, 0.1, 0.2, 0.3)
-    assert alg.name == name
+    assert alg.name == FakeAlgorithm.label(lambd) == name
 
 
 def test_get_action():
@@ -52,7 +53,7 @@ def test_learning():
     alg = FakeAlgorithm(env, 0.1, 0.2, 0.3, 0.4)
     steps_per_episode, e = alg.learn()
     assert len(steps_per_episode) == alg.episodes == 1
-    assert steps_per_episode[0] == len(e.steps)
+    assert steps_per_episode[0] == e.steps
     steps_per_episode, e = alg.learn(23)
     assert len(steps_per_episode) == alg.episodes == 24
 
@@ -63,3 +64,29 @@ def test_learning_with_stopping_when_learned():
     steps_per_episode, e = alg.learn(100, True, spe_gte=0, wsize=13)
     assert alg.is_learned(0, 0, 13)
     assert len(steps_per_episode) == 13
+
+
+def test_get_action_is_reproducible_with_seed():
+    actions = []
+    for i in range(2):
+        alg = FakeAlgorithm(FakeContinuousEnvironment(), 0.1, 0.5, 0.3, 0.4,
+                            seed=11)
+        actions.append([alg.get_action() for j in range(100)])
+    assert actions[0] == actions[1]
+    assert set(actions[0]) == set(alg.actions)
+
+
+@pytest.mark.parametrize('values,expected_actions', [
+    ([0.0, 1.0, 0.5], {1}),
+    ([1.0, 1.0, 0.5], {0, 1}),
+    ([0.0, 0.0, 0.0], {0, 1, 2})
+])
+def test_greedy_action_breaks_ties_at_random(values, expected_actions):
+    alg = FakeAlgorithm(FakeContinuousEnvironment(), 0.1, 0.2, 0.3, 0.4,
+                        seed=0)
+    alg.action_values = lambda environment_state: np.array(values)
+    actions = {alg.greedy_action() for i in range(200)}
+    assert actions == expected_actions
+    assert set(alg.get_greedy_actions()) == expected_actions
+    for a in alg.actions:
+        assert alg.is_greedy(None, a) == (a in expected_actions)
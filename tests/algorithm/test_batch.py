@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from rltoolbox.abstract import Algorithm
+from rltoolbox.algorithm import classic, cmac, fuzzy
+from rltoolbox.approximator import (
+    CMACApproximator,
+    FuzzyApproximator,
+    TableApproximator
+)
+from rltoolbox.environment.continuous import CartPole
+from rltoolbox.tests.fakes import (
+    FakeGridNoWallsEnvironment,
+    FakeGridWithWallsEnvironment
+)
+
+
+def randomized(algorithm):
+    rng = np.random.default_rng(0)
+    for name in algorithm.tables:
+        tables = getattr(algorithm, name)
+        for table in tables if isinstance(tables, list) else [tables]:
+            table[:] = rng.uniform(-1.0, 1.0, table.shape)
+    return algorithm
+
+
+def cartpole(approximator, **kwargs):
+    environment = CartPole()
+    environment.approximate_with(approximator, **kwargs)
+    return environment
+
+
+observations = np.random.default_rng(1).uniform(
+    (-2.4, -3.0, -0.2, -3.0), (2.4, 3.0, 0.2, 3.0), (200, 4)
+)
+
+
+@pytest.mark.parametrize('algorithm,environment', [
+    (classic.Q, FakeGridWithWallsEnvironment()),
+    (classic.AHC, FakeGridWithWallsEnvironment()),
+    (classic.SARSA, cartpole(TableApproximator)),
+    (cmac.CMACQ, cartpole(CMACApproximator, n_layers=3)),
+    (cmac.CMACAHC, cartpole(CMACApproximator)),
+    (fuzzy.FQ, cartpole(FuzzyApproximator))
+])
+def test_greedy_actions_equal_single_state_greedy_actions(algorithm,
+                                                          environment):
+    algorithm = randomized(algorithm(environment, seed=0))
+    if environment.approximator is None:
+        states = environment.states
+        singles = states
+    else:
+        states = environment.approximator.approximate_states(observations)
+        singles = [environment.approximator.approximate_state(observation)
+                   for observation in observations]
+    values = algorithm.batch_action_values(states)
+    expected = np.array([algorithm.action_values(s).copy() for s in singles])
+    assert np.allclose(values, expected)
+    assert np.array_equal(algorithm.greedy_actions(states, False),
+                          expected.argmax(1))
+    assert np.array_equal(algorithm.greedy_actions(states),
+                          expected.argmax(1))
+
+
+def test_default_batch_action_values_copy_reused_buffer():
+    environment = cartpole(CMACApproximator, n_layers=3)
+    algorithm = randomized(cmac.CMACQ(environment, seed=0))
+    states = environment.approximator.approximate_states(observations[:20])
+    values = Algorithm.batch_action_values(algorithm, states)
+    assert np.allclose(values, algorithm.batch_action_values(states))
+    assert not np.allclose(values, values[-1])
+
+
+def test_greedy_actions_break_ties_at_random():
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    algorithm.Q[:, 1] = algorithm.Q[:, 3] = 1.0
+    states = np.zeros(1000, dtype=int)
+    actions = algorithm.greedy_actions(states)
+    assert set(actions) == {1, 3}
+    assert 400 < np.count_nonzero(actions == 1) < 600
+    assert set(algorithm.greedy_actions(states, random_ties=False)) == {1}
+
+
+def test_state_zero_is_not_current_state():
+    environment = FakeGridNoWallsEnvironment()
+    algorithm = classic.Q(environment)
+    algorithm.Q[0, 2] = 1.0
+    assert environment.state != 0
+    assert list(algorithm.get_greedy_actions(0)) == [2]
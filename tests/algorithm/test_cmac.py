@@ -86,3 +86,18 @@ def test_CMACQ_CMACSARSA_CMACR_lambda_run_learning_episode(algorithm, lambd):
     assert isinstance(env, Environment)
     for l in range(algorithm.n_layers):
         assert sum([algorithm.q[l][:, i].sum() for i in algorithm.actions]) != 0.0
+
+
+def test_CMACQ_action_values_sum_layers_in_place():
+    environment = FakeContinuousEnvironment()
+    environment.approximate_with(CMACApproximator, n_layers=3)
+    algorithm = cmac.CMACQ(environment)
+    rng = np.random.default_rng(0)
+    for q in algorithm.q:
+        q[:] = rng.uniform(size=q.shape)
+    environment_state = (1, 2, 0)
+    values = algorithm.action_values(environment_state)
+    assert np.allclose(values, sum(
+        q[s] for q, s in zip(algorithm.q, environment_state)
+    ))
+    assert algorithm.action_values((0, 0, 0)) is values
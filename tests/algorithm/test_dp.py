@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from rltoolbox.algorithm import classic, dp
+from rltoolbox.environment.grid import *
+from rltoolbox.tests.fakes import FakeGridWithWallsEnvironment
+
+
+environments = (GRID66, GRID69, GRID2436, GRID1010, GRID2525)
+
+
+@pytest.mark.parametrize('env', environments)
+def test_value_iteration_equals_policy_iteration(env):
+    V, Q = dp.value_iteration(env, 0.9)
+    V_, Q_, policy = dp.policy_iteration(env, 0.9)
+    assert np.allclose(V, V_, atol=1e-6)
+    assert np.allclose(Q, Q_, atol=1e-6)
+    assert np.all(Q[np.arange(len(policy)), policy] >= Q.max(1) - 1e-6)
+
+
+@pytest.mark.parametrize('env', (GRID69, GRID2436))
+def test_optimal_value_of_start_is_discounted_goal_reward(env):
+    gamma = 0.95
+    start = env().state
+    V, Q = dp.value_iteration(env, gamma)
+    steps = dp.steps_to_goal(env)
+    assert np.isclose(V[start], gamma ** (steps[start] - 1))
+
+
+def test_steps_to_goal():
+    steps = dp.steps_to_goal(FakeGridWithWallsEnvironment).reshape(4, 4)
+    assert steps[0, 3] == 0
+    assert steps[0, 0] == 3
+    assert steps[3, 0] == 6
+    assert steps[1, 2] == np.inf
+    assert np.all(dp.steps_to_goal(GRID1010) == np.inf)
+
+
+def test_reachable_states():
+    reached = dp.reachable_states(GRID66)
+    assert reached[GRID66().state]
+    assert not reached[GRID66.grid.ravel() == GRID66.walls_mark].any()
+
+
+def test_compare_with_solution():
+    V, Q = dp.value_iteration(GRID69, 0.95)
+    algorithm = classic.Q(GRID69(), gamma=0.95)
+    algorithm.Q[:] = Q
+    comparison = dp.compare_with_solution(algorithm, Q)
+    assert comparison == {
+        'max_error': 0.0, 'mean_error': 0.0, 'optimal_actions': 1.0
+    }
+    algorithm.Q[:] = 0.0
+    comparison = dp.compare_with_solution(algorithm, Q)
+    assert comparison['max_error'] > 0.0
+    assert comparison['optimal_actions'] < 1.0
+
+
+def test_compare_AHC_with_solution():
+    V, Q = dp.value_iteration(GRID69, 0.95)
+    algorithm = classic.AHC(GRID69(), gamma=0.95)
+    algorithm.V[:] = V
+    algorithm.mi[:] = Q
+    comparison = dp.compare_with_solution(algorithm, Q)
+    assert comparison['max_error'] == 0.0
+    assert comparison['optimal_actions'] == 1.0
+
+
+@pytest.mark.parametrize('solver', [dp.value_iteration, dp.policy_iteration])
+def test_solvers_wrong_gamma(solver):
+    with pytest.raises(ValueError):
+        solver(GRID69, 1.0)
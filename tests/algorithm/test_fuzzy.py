@@ -5,6 +5,7 @@ from rltoolbox.abstract import Environment
 from rltoolbox.algorithm import fuzzy
 from rltoolbox.approximator import FuzzyApproximator
 from rltoolbox.tests.fakes import FakeContinuousEnvironment
+from rltoolbox.traces import EligibilityTraces, SparseEligibilityTraces
 from rltoolbox.fuzzy import (
     FuzzySet,
     TrapezoidalMembershipFunction,
@@ -128,3 +129,43 @@ def test_FR_lambda_run_learning_episode():
     env = algorithm.run_learning_episode()
     assert isinstance(env, Environment)
     assert sum([algorithm.q[i].sum() for i in algorithm.actions]) != 0.0
+
+
+def test_FQ_Q_equals_dense_fuzzy_inference():
+    environment = FakeContinuousEnvironment()
+    environment.approximate_with(FuzzyApproximator, fuzzy_sets=fuzzy_sets)
+    algorithm = fuzzy.FQ(environment)
+    algorithm.q[:] = np.random.default_rng(0).uniform(size=algorithm.q.shape)
+    for observation in [(-0.5, -0.5), (0.3, 2.0), (5.0, 0.0), (-0.1, 0.1)]:
+        state = environment.approximator.approximate_state(observation)
+        phi_s = fuzzy.phi(state)
+        expected_Q = np.array([
+            np.sum(algorithm.q[i] * phi_s) for i in algorithm.actions
+        ]) / phi_s.sum()
+        assert np.allclose(algorithm.Q(state), expected_Q)
+
+
+@pytest.mark.parametrize('algorithm', [fuzzy.FQ, fuzzy.FSARSA, fuzzy.FR])
+def test_fuzzy_sparse_traces_learning(algorithm):
+    environment = FakeContinuousEnvironment()
+    environment.approximate_with(FuzzyApproximator, fuzzy_sets=fuzzy_sets)
+    algorithm = algorithm(environment, lambd=0.5, trace_cutoff=0.0)
+    algorithm.run_learning_episode()
+    assert algorithm.q.any()
+
+
+@pytest.mark.parametrize('algorithm', [fuzzy.FQ, fuzzy.FSARSA, fuzzy.FR])
+def test_fuzzy_default_traces_are_sparse_and_match_dense_traces(algorithm):
+    tables = []
+    for traces in ('default', 'dense'):
+        environment = FakeContinuousEnvironment()
+        environment.approximate_with(FuzzyApproximator, fuzzy_sets=fuzzy_sets)
+        alg = algorithm(environment, lambd=0.5, seed=3)
+        if traces == 'dense':
+            alg.create_traces = lambda: EligibilityTraces(alg.q_rules.shape)
+        else:
+            assert type(alg.create_traces()) is SparseEligibilityTraces
+        alg.learn(2, print_status=False)
+        tables.append(alg.q)
+    assert tables[0].any()
+    assert np.allclose(tables[0], tables[1])
@@ -107,3 +107,27 @@ def test_approximate_state(n_state_variables, state_variables_ranges, n_layers,
                                     n_layers)
     state = approximator.approximate_state(state_variables)
     assert state == expected_state
+
+
+@pytest.mark.parametrize('n_state_variables,state_variables_ranges,n_layers', [
+    (2, [[0.0], []], 3),
+    (1, [[1.0, 2.0, 3.0]], 2),
+    (2, [[-1.0, 5.0], [1.0, 4.0, 7.0]], 3),
+    (2, [[-0.2, 0.2], [-0.2, 0.2]], 8)
+])
+def test_approximate_states_matches_layers(n_state_variables,
+                                           state_variables_ranges, n_layers):
+    approximator = CMACApproximator(n_state_variables, state_variables_ranges,
+                                    n_layers)
+    assert approximator.offsets.shape[:2] == (n_layers, n_state_variables)
+    rng = np.random.default_rng(0)
+    observations = rng.uniform(-8.0, 10.0, (300, n_state_variables))
+    states = approximator.approximate_states(observations)
+    assert states.shape == (300, n_layers)
+    for observation, state in zip(observations, states):
+        expected_state = tuple(
+            layer.approximate_state(observation)
+            for layer in approximator.layers
+        )
+        assert approximator.approximate_state(observation) == expected_state
+        assert tuple(state) == expected_state
@@ -1,3 +1,4 @@
+import numpy as np
 from numpy import inf
 import pytest
 
@@ -85,3 +86,46 @@ def test_approximate_state():
     state = fa.approximate_state(state_variables)
     for i, s in enumerate(state):
         assert s.all() == fa.fuzzy_sets[i].membership_grades(state_variables[i]).all()
+
+
+@pytest.mark.parametrize('fuzzy_sets', [
+    None,
+    [fuzzy.FuzzySet.from_membership_functions_ranges([(-1.0, 0.0, 1.0)]),
+     fuzzy.FuzzySet([]),
+     fuzzy.FuzzySet.from_membership_functions_ranges([
+         (-inf, -inf, 0.0, 1.0), (0.0, 1.0, 2.0), (1.0, 2.0, inf, inf)
+     ])]
+])
+def test_approximate_states(fuzzy_sets):
+    fa = FuzzyApproximator(3, [[0.0], [-1.0, 1.0], [0.5, 1.0, 1.5, 2.0]],
+                           fuzzy_sets)
+    observations = np.random.default_rng(0).uniform(-2.0, 3.0, (100, 3))
+    grades = fa.approximate_states(observations)
+    n_mfs = max(len(fs.membership_functions) for fs in fa.fuzzy_sets)
+    assert grades.shape == (100, 3, n_mfs)
+    for observation, observation_grades in zip(observations, grades):
+        state = fa.approximate_state(observation)
+        for i, fs in enumerate(fa.fuzzy_sets):
+            n = len(fs.membership_functions)
+            expected_grades = fs.membership_grades(observation[i])
+            assert np.array_equal(state[i], expected_grades)
+            assert np.array_equal(observation_grades[i, :n], expected_grades)
+            assert not observation_grades[i, n:].any()
+
+
+@pytest.mark.parametrize('n_vars,svr', [
+    (1, [[0.0]]),
+    (2, [[-0.2, 0.2], [-0.2, 0.2]]),
+    (4, [[-1.44, -0.48, 0.48, 1.44], [-2/3, 2/3], [-0.1, 0.0, 0.1], [1.0]])
+])
+def test_active_rules(n_vars, svr):
+    from rltoolbox.algorithm.fuzzy import phi
+    fa = FuzzyApproximator(n_vars, svr)
+    rng = np.random.default_rng(0)
+    for observation in rng.uniform(-2.0, 2.0, (50, n_vars)):
+        state = fa.approximate_state(observation)
+        rules, weights = fa.active_rules(state)
+        assert len(rules) <= 2 ** n_vars
+        expected_phi = phi(state).ravel()
+        assert np.array_equal(np.sort(rules), np.flatnonzero(expected_phi))
+        assert np.array_equal(weights, expected_phi[rules])
@@ -87,3 +87,27 @@ def test_approximate_state(n_state_vars, state_vars_ranges, state_vars, expected
     apx = TableApproximator(n_state_vars, state_vars_ranges)
     state = apx.approximate_state(state_vars)
     assert state == expected_state
+
+
+@pytest.mark.parametrize('n_state_vars,state_vars_ranges', [
+    (1, [[0.0, 1.0, 2.0, 3.0]]),
+    (2, [[1.0], []]),
+    (2, [[-0.2, 0.2], [-0.2, 0.2]]),
+    (3, [[0.0], [2.0, -1.0, 0.0], [1.1, 1.2, 2.3, 2.4]]),
+    (4, [[-1.44, -0.48, 0.48, 1.44], [-2/3, 2/3], [-0.1, 0.0, 0.1], [-1, 1]])
+])
+def test_approximate_states_matches_encoding(n_state_vars, state_vars_ranges):
+    apx = TableApproximator(n_state_vars, state_vars_ranges)
+    rng = np.random.default_rng(0)
+    edges = sum(state_vars_ranges, [0.0])
+    observations = rng.uniform(-3.0, 3.0, (500, n_state_vars))
+    observations[::5] = rng.choice(edges, (100, n_state_vars))
+    states = apx.approximate_states(observations)
+    assert states.shape == (500,)
+    for observation, state in zip(observations, states):
+        expected_state = TableApproximator.encode_state([
+            TableApproximator.approximate_state_variable(value, ranges)
+            for value, ranges in zip(observation, state_vars_ranges)
+        ], apx.state_shape)
+        assert apx.approximate_state(tuple(observation)) == expected_state
+        assert state == expected_state
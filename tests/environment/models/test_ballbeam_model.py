@@ -45,3 +45,28 @@ def test_ball_beam_step(init_params, expected_observation_less_and_greater):
     assert bb.beam_theta == init_params[2]
     assert exp[0] < observation[0] < exp[1]
     assert exp[2] < observation[1] < exp[3]
+
+
+@pytest.mark.parametrize('init_params,control,n_steps,bound', [
+    ([0.0, 0.0], 0.3, 50, np.inf),
+    ([0.0, 0.0], 0.0, 50, 1.0),
+    ([0.5, 0.3], -0.2, 200, 1.0),
+    ([0.9, 1.5], -0.7, 200, 1.0),
+    ([-0.9, -1.0], 0.7, 200, 1.0),
+    ([0.2, 0.0], 0.1, 100, 1.0),
+    ([1.2, 0.0], 0.1, 10, 1.0)
+])
+def test_ball_beam_advance_equals_steps(init_params, control, n_steps,
+                                        bound):
+    stepped = BallBeam(*init_params)
+    expected_n_steps = 0
+    for i in range(n_steps):
+        stepped.step(control)
+        expected_n_steps += 1
+        if abs(stepped.ball_position) >= bound:
+            break
+    advanced = BallBeam(*init_params)
+    assert advanced.advance(control, n_steps, bound) == expected_n_steps
+    assert advanced.current_step == expected_n_steps
+    assert advanced.beam_theta == control
+    assert np.allclose(advanced.observation, stepped.observation)
@@ -16,9 +16,20 @@ def test_cart_pole_observation():
 def test_cart_pole_render_without_fail():
     cp = CartPole()
     cp.render()
+    assert cp.viewer.track_center_mark is not None
+    cp.render()
     cp.close()
 
 
+def test_cart_pole_stops_at_track_bound():
+    cp = CartPole(init_cart_position=2.39, init_cart_speed=1.0)
+    observation = cp.step(0.0)
+    assert observation[0] == cp.track_length / 2
+    assert observation[1] == cp.cart_speed
+    assert abs(cp.cart_speed) < 0.1
+    assert not hasattr(cp, '__dict__')
+
+
 def test_cart_pole_reset():
     cp = CartPole(init_cart_position=0.1, init_cart_speed=0.2,
                   init_pole_angle=0.3, init_pole_speed=0.4, timestep=0.1)
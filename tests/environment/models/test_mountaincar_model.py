@@ -45,3 +45,19 @@ def test_mountain_car_step(init_params, expected_observation_less_and_greater):
     assert mc.car_acceleration == init_params[2]
     assert exp[0] < observation[0] < exp[1]
     assert exp[2] < observation[1] < exp[3]
+
+
+def test_mountain_car_timestep_is_ignored_without_integrator():
+    # legacy call signature, timestep has never changed dynamics
+    mc = MountainCar(-0.5, 0.0, 0.0, 0.04)
+    position, speed = -0.5, 0.0
+    for control in [1.0] * 30 + [-1.0] * 30:
+        observation = mc.step(control)
+        speed = min(max(speed + 0.001 * control - 0.0025 *
+                        np.cos(3 * position), -0.07), 0.07)
+        position += speed
+        if not -1.2 <= position <= 0.5:
+            position, speed = min(max(position, -1.2), 0.5), 0.0
+        assert observation == pytest.approx((position, speed), abs=1e-12)
+    assert mc.timestep == 0.04
+    assert mc.integrator == 'semi_implicit'
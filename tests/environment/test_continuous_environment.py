@@ -66,3 +66,44 @@ def test_non_approximated_environments_doing_action(env, action_index):
     next_state = e.do_action(action_index)
     assert next_state == e.state
     assert next_state != state
+
+
+@pytest.mark.parametrize('env', [BallBeam, MountainCar, CartPole])
+def test_step_matches_properties(env):
+    e = env(max_steps=300)
+    rng = np.random.default_rng(0)
+    done = False
+    while not done:
+        state, reward, done = e.step(rng.integers(len(e.actions)))
+        assert state == e.state
+        assert reward == e.reward
+        assert done == e.done
+
+
+@pytest.mark.parametrize('env', [BallBeam, MountainCar, CartPole])
+@pytest.mark.parametrize('action_repeat', [1, 4])
+def test_action_repeat(env, action_repeat):
+    repeating = env(action_repeat=action_repeat)
+    single = env()
+    rng = np.random.default_rng(2)
+    for i in range(300):
+        action_index = rng.integers(len(single.actions))
+        rewards = 0.0
+        for k in range(action_repeat):
+            state, reward, done = single.step(action_index)
+            rewards += reward
+            if single.is_state_absorbing():
+                break
+        state, reward, done = repeating.step(action_index)
+        assert np.allclose(repeating.model.observation,
+                           single.model.observation)
+        assert reward == rewards
+        assert done == single.is_state_absorbing()
+        assert repeating.steps == i + 1
+        if done:
+            break
+
+
+def test_invalid_action_repeat():
+    with pytest.raises(ValueError):
+        BallBeam(action_repeat=0)
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 
 from rltoolbox.environment.grid import *
+from rltoolbox.environment.models import Grid
 
 
 environments = (GRID66, GRID69, GRID2436, GRID1010, GRID2525)
@@ -18,3 +20,65 @@ def test_model_grid(env,shape):
 def test_wall_marks(env,mark):
     e = env()
     assert e.model.walls_mark == mark
+
+
+@pytest.mark.parametrize('env', environments)
+def test_compiled_transitions_match_model(env):
+    e = env()
+    rng = np.random.default_rng(0)
+    for action_index in rng.integers(len(e.actions), size=500):
+        if e.done:
+            e.clear()
+        position = e.model.observation
+        model = Grid(position, e.grid, e.walls_mark)
+        expected_position = model.step(e.actions[action_index])
+        state = e.do_action(action_index)
+        assert e.model.observation == expected_position
+        assert state == e.get_state()
+        assert e.reward == e.grid[expected_position]
+        assert e.is_state_absorbing() == (e.grid[expected_position] != 0.0)
+
+
+@pytest.mark.parametrize('env', environments)
+def test_step_matches_properties(env):
+    e = env(max_steps=200)
+    rng = np.random.default_rng(1)
+    for i in range(3):
+        e.clear()
+        done = False
+        while not done:
+            state, reward, done = e.step(rng.integers(len(e.actions)))
+            assert state == e.state == e.get_state()
+            assert reward == e.reward
+            assert done == e.done
+        assert e.episode_return == reward
+
+
+def test_compile_is_done_once_per_class():
+    assert GRID66.compile() is GRID66().compile()
+    assert GRID66.compile() is not GRID69.compile()
+    next_states, rewards, absorbing = GRID66.compile()
+    assert next_states.shape == (GRID66.grid.size, len(GRID66.actions))
+    assert rewards.shape == absorbing.shape == (GRID66.grid.size,)
+
+
+@pytest.mark.parametrize('env', environments)
+def test_action_repeat(env):
+    repeating = env(action_repeat=3)
+    single = env()
+    assert repeating.action_repeat == 3
+    rng = np.random.default_rng(2)
+    done = False
+    while not done:
+        action_index = rng.integers(len(single.actions))
+        reward = 0.0
+        for k in range(3):
+            state, single_reward, _ = single.step(action_index)
+            reward += single_reward
+            if single.is_state_absorbing():
+                break
+        state_, reward_, done = repeating.step(action_index)
+        assert state_ == state == repeating.get_state()
+        assert reward_ == reward
+        assert repeating.model.current_step == single.model.current_step
+    assert repeating.steps <= single.steps
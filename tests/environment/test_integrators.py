@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from rltoolbox.environment import continuous
+from rltoolbox.environment.integrators import integrators
+from rltoolbox.environment.models import BallBeam, CartPole, Grid, MountainCar
+
+
+def oscillator(variables):
+    return (variables[1], -variables[0])
+
+
+def oscillator_error(integrator, dt):
+    variables = (1.0, 0.0)
+    for i in range(int(round(1.0 / dt))):
+        variables = integrators[integrator](oscillator, variables, dt,
+                                            ((0, 1),))
+    return abs(variables[0] - np.cos(1.0)) + abs(variables[1] + np.sin(1.0))
+
+
+@pytest.mark.parametrize('integrator,order', [
+    ('euler', 1),
+    ('semi_implicit', 1),
+    ('rk4', 4)
+])
+def test_integrators_order(integrator, order):
+    ratio = oscillator_error(integrator, 0.01) / \
+        oscillator_error(integrator, 0.005)
+    assert 2 ** order * 0.8 < ratio < 2 ** order * 1.2
+
+
+@pytest.mark.parametrize('model', [BallBeam, CartPole])
+def test_native_euler_step_matches_derivatives(model):
+    m = model()
+    for i in range(10):
+        variables = tuple(m.variables)
+        derivatives = m.derivatives(variables)
+        observation = m.step()
+        assert np.allclose(observation, [
+            v + m.timestep * d for v, d in zip(variables, derivatives)
+        ])
+
+
+def test_native_mountain_car_step_is_semi_implicit():
+    m = MountainCar(init_car_position=-0.5, init_car_speed=0.01,
+                    init_car_acceleration=1.0)
+    for i in range(20):
+        variables = integrators['semi_implicit'](
+            m.derivatives, tuple(m.variables), 1.0, m.coordinates
+        )
+        assert np.allclose(m.step(1.0), variables)
+    assert m.integrator == 'semi_implicit' and not m.integrated
+
+
+def test_mountain_car_native_integrator_is_default():
+    m = MountainCar(integrator='semi_implicit')
+    default = MountainCar()
+    assert m.timestep == default.timestep
+    for i in range(20):
+        assert m.step(1.0) == default.step(1.0)
+
+
+def test_mountain_car_timestep_with_integrator():
+    # speed after euler step doesn't depend on position change
+    m = MountainCar(integrator='euler')
+    assert m.timestep == MountainCar(integrator='rk4').timestep == 1.0
+    half = MountainCar(timestep=0.5, integrator='euler')
+    native = MountainCar()
+    m.step(1.0)
+    half.step(1.0)
+    native.step(1.0)
+    assert np.allclose(m.car_speed, native.car_speed)
+    assert np.allclose(half.car_speed, native.car_speed / 2)
+
+
+@pytest.mark.parametrize('integrator', ['euler', 'semi_implicit', 'rk4'])
+def test_mountain_car_reaches_goal_with_integrator(integrator):
+    env = continuous.MountainCar(integrator=integrator, max_steps=1000)
+    done = False
+    while not done:
+        state, reward, done = env.step(2 if env.model.car_speed >= 0 else 0)
+    assert reward == 1.0
+
+
+@pytest.mark.parametrize('model,control', [
+    (BallBeam, 0.2),
+    (CartPole, 10.0),
+    (MountainCar, 1.0)
+])
+@pytest.mark.parametrize('integrator', ['euler', 'semi_implicit', 'rk4'])
+def test_model_integrators(model, control, integrator):
+    m = model(integrator=integrator)
+    assert m.integrator == integrator
+    for i in range(5):
+        observation = m.step(control)
+    assert m.current_step == 5
+    assert observation == m.observation
+    assert all(np.isfinite(observation))
+    m.reset()
+    assert m.current_step == 0
+
+
+def test_ball_beam_rk4_is_exact():
+    # acceleration is constant for fixed beam angle
+    m = BallBeam(init_ball_position=0.1, init_ball_speed=0.2,
+                 init_beam_theta=0.3, timestep=0.1, integrator='rk4')
+    for i in range(10):
+        m.step()
+    acceleration = 9.81 * np.sin(0.3)
+    assert np.allclose(m.observation, (0.1 + 0.2 + acceleration / 2,
+                                       0.2 + acceleration))
+
+
+def test_ball_beam_advance_with_other_integrator():
+    m = BallBeam(init_ball_position=0.5, init_ball_speed=0.3,
+                 integrator='rk4')
+    n = m.advance(0.5, 1000, 1.0)
+    assert n == m.current_step < 1000
+    assert abs(m.ball_position) >= 1.0
+
+
+def test_mountain_car_integrators_keep_bounds():
+    m = MountainCar(init_car_position=0.45, init_car_speed=0.07,
+                    timestep=1.0, integrator='rk4')
+    m.step(1.0)
+    assert m.observation == (0.5, 0.0)
+
+
+def test_environment_with_integrator():
+    env = continuous.CartPole(integrator='rk4', timestep=0.05,
+                              action_repeat=2)
+    assert env.model.integrator == 'rk4'
+    assert env.model.timestep == 0.05
+    done = False
+    while not done:
+        state, reward, done = env.step(0)
+    assert reward == -1.0
+
+
+def test_invalid_integrators():
+    with pytest.raises(ValueError):
+        BallBeam(integrator='leapfrog')
+    with pytest.raises(ValueError):
+        Grid(integrator='rk4')
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from rltoolbox.environment import continuous
+from rltoolbox.environment.vector import *
+
+
+@pytest.mark.parametrize('vector_env,env,init_params', [
+    (VectorBallBeam, continuous.BallBeam, {}),
+    (VectorBallBeam, continuous.BallBeam, {'init_ball_position': 0.5}),
+    (VectorMountainCar, continuous.MountainCar, {}),
+    (VectorMountainCar, continuous.MountainCar, {'init_car_position': 0.3}),
+    (VectorCartPole, continuous.CartPole, {}),
+    (VectorCartPole, continuous.CartPole, {'init_cart_position': 2.3,
+                                           'init_cart_speed': 3.0})
+])
+def test_vector_environment_steps_like_environments(vector_env, env,
+                                                    init_params):
+    n_environments, n_steps = 5, 300
+    rng = np.random.default_rng(0)
+    actions = rng.integers(len(env.actions), size=(n_steps, n_environments))
+    vector = vector_env(n_environments, 50, **init_params)
+    singles = [env(50, **init_params) for i in range(n_environments)]
+    for step_actions in actions:
+        observations, rewards, dones = vector.step(step_actions)
+        for i, single in enumerate(singles):
+            single.do_action(step_actions[i])
+            assert dones[i] == single.done
+            assert rewards[i] == single.reward
+            if single.done:
+                assert np.allclose(vector.terminal_observations[i],
+                                   single.model.observation)
+                single.clear()
+            assert np.allclose(observations[i], single.model.observation)
+
+
+def test_vector_environment_reset():
+    vector = VectorBallBeam(3)
+    vector.step([0, 1, 2])
+    assert np.all(vector.steps == 1)
+    vector.reset(np.array([True, False, True]))
+    assert list(vector.steps) == [0, 1, 0]
+    assert np.array_equal(vector.observations[0], (0.0, 0.0))
+    assert not np.array_equal(vector.observations[1], (0.0, 0.0))
+
+
+def test_vector_environment_done_after_max_steps():
+    vector = VectorMountainCar(4, max_steps=3)
+    for i in range(2):
+        observations, rewards, dones = vector.step([1, 1, 1, 1])
+        assert not dones.any()
+    observations, rewards, dones = vector.step([1, 1, 1, 1])
+    assert dones.all()
+    assert np.all(vector.steps == 0)
+
+
+def test_vector_environment_wrong_size():
+    with pytest.raises(ValueError):
+        VectorCartPole(0)
+
+
+def test_vector_environment_action_repeat():
+    with pytest.raises(ValueError):
+        VectorBallBeam(2, action_repeat=2)
+
+
+def test_vector_environment_integrator():
+    with pytest.raises(ValueError):
+        VectorCartPole(2, integrator='rk4')
+    with pytest.raises(ValueError):
+        VectorMountainCar(2, integrator='rk4')
+    # naming native integrator is no-op, timestep of native update is
+    # ignored
+    VectorMountainCar(2, timestep=0.5, integrator='semi_implicit')
@@ -6,6 +6,7 @@ from rltoolbox.algorithm.abstract import (
     CMACAlgorithm,
     FuzzyAlgorithm
 )
+from rltoolbox.approximator import CMACApproximator, FuzzyApproximator
 from rltoolbox.environment.grid import GridEnvironment
 
 
@@ -49,8 +50,7 @@ class FakeContinuousEnvironment(Environment):
         [-1.0, 1.0]
     ]
     
-    @property
-    def reward(self):
+    def get_reward(self, absorbing):
         return 1.0
 
     def is_state_absorbing(self):
@@ -77,8 +77,8 @@ class FakeGridWithWallsEnvironment(GridEnvironment):
 
 class FakeAlgorithm(Algorithm):
 
-    def get_greedy_actions(self):
-        return [self.actions[0]]
+    def action_values(self, environment_state):
+        return np.eye(len(self.actions))[0]
 
     def run_learning_episode(self, render=False):
         pass
@@ -86,8 +86,8 @@ class FakeAlgorithm(Algorithm):
 
 class FakeClassicalAlgorithm(ClassicAlgorithm):
 
-    def get_greedy_actions(self):
-        return [self.actions[0]]
+    def action_values(self, environment_state):
+        return np.eye(len(self.actions))[0]
 
     def run_learning_episode(self, render=False):
         pass
@@ -95,8 +95,8 @@ class FakeClassicalAlgorithm(ClassicAlgorithm):
 
 class FakeCMACAlgorithm(CMACAlgorithm):
 
-    def get_greedy_actions(self):
-        return [self.actions[0]]
+    def action_values(self, environment_state):
+        return np.eye(len(self.actions))[0]
 
     def run_learning_episode(self, render=False):
         pass
@@ -104,8 +104,8 @@ class FakeCMACAlgorithm(CMACAlgorithm):
 
 class FakeFuzzyAlgorithm(FuzzyAlgorithm):
 
-    def get_greedy_actions(self):
-        return [self.actions[0]]
+    def action_values(self, environment_state):
+        return np.eye(len(self.actions))[0]
 
     def run_learning_episode(self, render=False):
         pass
@@ -119,3 +119,12 @@ class FakeApproximator(Approximator):
 
     def approximate_state(self, observation):
         return 0 if sum(observation) < 0 else 1
+
+
+def fuzzy_environment():
+    return FakeContinuousEnvironment().approximate_with(FuzzyApproximator)
+
+
+def cmac_environment(n_layers=3):
+    return FakeContinuousEnvironment().approximate_with(CMACApproximator,
+                                                        n_layers=n_layers)
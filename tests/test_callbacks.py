@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from rltoolbox.algorithm import classic
+from rltoolbox.callbacks import (
+    Callback,
+    ConsolePrinter,
+    JSONLWriter,
+    MetricsCollector
+)
+from rltoolbox.profiling import Profiler
+from rltoolbox.tests.fakes import (
+    FakeGridNoWallsEnvironment,
+    FakeGridWithWallsEnvironment
+)
+
+
+class EventsRecorder(Callback):
+
+    def __init__(self):
+        self.events = []
+
+    def on_learn_start(self, algorithm, n_episodes):
+        self.events.append(('learn_start', n_episodes))
+
+    def on_episode_start(self, algorithm):
+        self.events.append(('episode_start', algorithm.episodes + 1))
+
+    def on_episode_end(self, algorithm, metrics):
+        self.events.append(('episode_end', metrics['episode']))
+
+    def on_checkpoint(self, algorithm, path):
+        self.events.append(('checkpoint', algorithm.episodes))
+
+    def on_learn_end(self, algorithm):
+        self.events.append(('learn_end', algorithm.episodes))
+
+
+def test_events_order(tmp_path):
+    recorder = EventsRecorder()
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    algorithm.learn(2, print_status=False, callbacks=[recorder],
+                    checkpoint_path=str(tmp_path / 'q.npz'),
+                    checkpoint_every=2)
+    assert recorder.events == [
+        ('learn_start', 2),
+        ('episode_start', 1), ('episode_end', 1),
+        ('episode_start', 2), ('episode_end', 2), ('checkpoint', 2),
+        ('learn_end', 2)
+    ]
+
+
+def test_learn_end_after_failed_episode(tmp_path):
+    path = tmp_path / 'metrics.jsonl'
+    recorder = EventsRecorder()
+    writer = JSONLWriter(str(path), batch_size=10)
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    run_learning_episode = algorithm.run_learning_episode
+
+    def second_episode_fails(render=False):
+        if algorithm.episodes:
+            raise RuntimeError("episode failed")
+        run_learning_episode(render=render)
+
+    algorithm.run_learning_episode = second_episode_fails
+    with pytest.raises(RuntimeError):
+        algorithm.learn(3, print_status=False, callbacks=[recorder, writer])
+    assert recorder.events == [
+        ('learn_start', 3),
+        ('episode_start', 1), ('episode_end', 1),
+        ('episode_start', 2),
+        ('learn_end', 1)
+    ]
+    # metrics of episode learned before failure are flushed
+    assert len(path.read_text().splitlines()) == 1
+
+
+def test_steps_per_second_of_unmeasured_episode(monkeypatch):
+    collector = MetricsCollector()
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    monkeypatch.setattr('time.perf_counter', lambda: 1.0)
+    algorithm.learn(1, print_status=False, callbacks=[collector])
+    assert collector.metrics['wall_time'] == [0.0]
+    assert collector.metrics['steps_per_second'] == [0.0]
+
+
+@pytest.mark.parametrize('environment,reward', [
+    (FakeGridWithWallsEnvironment, 1.0),
+    (FakeGridNoWallsEnvironment, -1.0)
+])
+def test_metrics_collector(environment, reward):
+    collector = MetricsCollector()
+    algorithm = classic.SARSA(environment(), seed=0)
+    algorithm.learn(5, print_status=False, callbacks=[collector])
+    assert collector.metrics['episode'] == [1, 2, 3, 4, 5]
+    assert collector.metrics['steps'] == algorithm.steps_per_episode
+    # only absorbing state ending episode is rewarded
+    assert collector.metrics['return'] == [reward] * 5
+    assert all(time > 0.0 for time in collector.metrics['wall_time'])
+    for steps, time, rate in zip(collector.metrics['steps'],
+                                 collector.metrics['wall_time'],
+                                 collector.metrics['steps_per_second']):
+        assert rate == pytest.approx(steps / time)
+    assert collector.metrics['profile'] == [None] * 5
+
+
+def test_jsonl_writer_batches_lines(tmp_path):
+    path = tmp_path / 'metrics.jsonl'
+    writer = JSONLWriter(str(path), batch_size=3)
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    writer.on_learn_start(algorithm, 5)
+    for i in range(5):
+        algorithm.learn(1, print_status=False)
+        writer.on_episode_end(algorithm, {'episode': algorithm.episodes})
+        assert len(path.read_text().splitlines() if path.exists() else []) \
+            == (3 if i >= 2 else 0)
+    writer.on_learn_end(algorithm)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line['episode'] for line in lines] == [1, 2, 3, 4, 5]
+    assert lines[0]['algorithm'] == 'Q(0)'
+    assert lines[0]['environment'] == 'FakeGridWithWallsEnvironment'
+
+
+def test_jsonl_writer_in_learning(tmp_path):
+    path = tmp_path / 'metrics.jsonl'
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    algorithm.learn(4, print_status=False, profiler=Profiler(),
+                    callbacks=[JSONLWriter(str(path), batch_size=100)])
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line['steps'] for line in lines] == algorithm.steps_per_episode
+    assert all(line['profile']['calls']['environment'] == line['steps']
+               for line in lines)
+
+
+@pytest.mark.parametrize('interval,n_printed', [(0.0, 4), (3600.0, 2)])
+def test_console_printer_rate_limit(capsys, interval, n_printed):
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    algorithm.learn(4, print_status=False,
+                    callbacks=[ConsolePrinter(interval)])
+    output = capsys.readouterr().out
+    assert output.count('episode:') == n_printed
+    # last episode is always printed
+    assert 'episode:     4' in output
+
+
+def test_print_status(capsys):
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    algorithm.learn(1)
+    assert 'episode:     1' in capsys.readouterr().out
+    algorithm.learn(1, print_status=False)
+    assert capsys.readouterr().out == ''
+
+
+def test_invalid_batch_size(tmp_path):
+    with pytest.raises(ValueError):
+        JSONLWriter(str(tmp_path / 'metrics.jsonl'), batch_size=0)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from rltoolbox.algorithm import classic, cmac, fuzzy
+from rltoolbox.approximator import TableApproximator
+from rltoolbox.checkpoint import load_arrays, save_arrays
+from rltoolbox.tests.fakes import (
+    FakeContinuousEnvironment,
+    FakeGridNoWallsEnvironment,
+    FakeGridWithWallsEnvironment,
+    cmac_environment,
+    fuzzy_environment
+)
+
+
+@pytest.mark.parametrize('mmap_mode', [None, 'r', 'c'])
+def test_save_load_arrays(tmp_path, mmap_mode):
+    path = str(tmp_path / 'arrays.npz')
+    arrays = {'a': np.arange(12.0).reshape(3, 4), 'b': np.array([1, 2, 3])}
+    save_arrays(path, arrays, {'x': np.int64(1), 'y': (1.0, 2.0)})
+    loaded, metadata = load_arrays(path, mmap_mode)
+    assert metadata == {'x': 1, 'y': [1.0, 2.0]}
+    assert set(loaded) == {'a', 'b'}
+    for name, array in arrays.items():
+        assert np.array_equal(loaded[name], array)
+        assert isinstance(loaded[name], np.memmap) is (mmap_mode is not None)
+
+
+@pytest.mark.parametrize('algorithm,environment,params', [
+    (classic.Q, FakeGridWithWallsEnvironment, {'lambd': 0.5}),
+    (classic.AHC, FakeGridWithWallsEnvironment, {}),
+    (classic.R, FakeGridWithWallsEnvironment, {'beta': 0.02}),
+    (cmac.CMACQ, cmac_environment, {}),
+    (cmac.CMACAHC, cmac_environment, {}),
+    (fuzzy.FSARSA, fuzzy_environment, {})
+])
+@pytest.mark.parametrize('mmap_mode', [None, 'c'])
+def test_resumed_learning_equals_uninterrupted_learning(
+        tmp_path, algorithm, environment, params, mmap_mode):
+    path = str(tmp_path / 'checkpoint.npz')
+    uninterrupted = algorithm(environment(), seed=1, **params)
+    uninterrupted.learn(6, print_status=False)
+    interrupted = algorithm(environment(), seed=1, **params)
+    interrupted.learn(3, print_status=False)
+    interrupted.save(path)
+    resumed = algorithm(environment(), seed=2).load(path, mmap_mode)
+    assert resumed.alpha == uninterrupted.alpha
+    assert resumed.lambd == uninterrupted.lambd
+    resumed.learn(3, print_status=False)
+    assert resumed.steps_per_episode == uninterrupted.steps_per_episode
+    for name in algorithm.tables:
+        tables, expected = getattr(resumed, name), getattr(uninterrupted, name)
+        if not isinstance(tables, list):
+            tables, expected = [tables], [expected]
+        for table, expected_table in zip(tables, expected):
+            assert np.allclose(table, expected_table)
+
+
+def test_load_into_different_algorithm_or_environment(tmp_path):
+    path = str(tmp_path / 'checkpoint.npz')
+    classic.Q(FakeGridWithWallsEnvironment()).save(path)
+    with pytest.raises(ValueError):
+        classic.SARSA(FakeGridWithWallsEnvironment()).load(path)
+    with pytest.raises(ValueError):
+        classic.Q(FakeGridNoWallsEnvironment()).load(path)
+    environment = FakeContinuousEnvironment()
+    environment.approximate_with(TableApproximator)
+    with pytest.raises(ValueError):
+        classic.Q(environment).load(path)
+
+
+@pytest.mark.parametrize('every,interval,expected_saved', [
+    (None, None, False),
+    (2, None, True),
+    (5, None, False),
+    (None, 0.0, True)
+])
+def test_learn_checkpoints(tmp_path, every, interval, expected_saved):
+    path = tmp_path / 'checkpoint.npz'
+    algorithm = classic.Q(FakeGridWithWallsEnvironment())
+    algorithm.learn(3, print_status=False, checkpoint_path=str(path),
+                    checkpoint_every=every, checkpoint_interval=interval)
+    assert path.exists() is expected_saved
+    if expected_saved:
+        loaded = classic.Q(FakeGridWithWallsEnvironment()).load(str(path))
+        assert len(loaded.steps_per_episode) in (2, 3)
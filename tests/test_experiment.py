@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from rltoolbox.algorithm import classic
+from rltoolbox.approximator import TableApproximator
+from rltoolbox.experiment import run_experiment, successive_halving
+from rltoolbox.tests.fakes import (
+    FakeContinuousEnvironment,
+    FakeGridWithWallsEnvironment
+)
+
+
+PARAMS = {'alpha': 0.1, 'epsilon': 0.1, 'gamma': 0.95, 'lambd': 0.0}
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_run_experiment(n_workers):
+    learning_curves = run_experiment(
+        classic.Q, FakeGridWithWallsEnvironment, params=PARAMS,
+        n_episodes=4, n_repeats=3, n_workers=n_workers, seed=5
+    )
+    assert learning_curves.shape == (3, 4)
+    assert not np.isnan(learning_curves).any()
+    assert np.all(learning_curves >= 1)
+
+
+def test_run_experiment_results_depend_only_on_seed():
+    results = [
+        run_experiment(classic.Q, FakeGridWithWallsEnvironment, params=PARAMS,
+                       n_episodes=5, n_repeats=3, n_workers=n_workers, seed=1)
+        for n_workers in (1, 3)
+    ]
+    assert np.array_equal(results[0], results[1])
+    assert not np.array_equal(results[0][0], results[0][1])
+
+
+def test_run_experiment_with_approximator():
+    learning_curves = run_experiment(
+        classic.SARSA, FakeContinuousEnvironment, TableApproximator,
+        params={'alpha': 0.1, 'gamma': 0.95}, n_episodes=2, n_repeats=2,
+        n_workers=1
+    )
+    assert np.array_equal(learning_curves, np.full((2, 2), 100.0))
+
+
+@pytest.mark.parametrize('n_episodes,n_repeats', [(0, 1), (1, 0)])
+def test_run_experiment_wrong_sizes(n_episodes, n_repeats):
+    with pytest.raises(ValueError):
+        run_experiment(classic.Q, FakeGridWithWallsEnvironment,
+                       n_episodes=n_episodes, n_repeats=n_repeats)
+
+
+def test_run_experiment_seed_in_params():
+    with pytest.raises(ValueError):
+        run_experiment(classic.Q, FakeGridWithWallsEnvironment,
+                       params={'seed': 0}, n_repeats=2)
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_successive_halving(n_workers):
+    learning_curves = successive_halving(
+        classic.Q, FakeGridWithWallsEnvironment,
+        {'alpha': [0.1, 0.3, 0.5, 0.7], 'lambd': [0.0]},
+        params={'epsilon': 0.1, 'gamma': 0.95}, n_episodes=8, n_repeats=2,
+        min_episodes=2, eta=2, n_workers=n_workers, seed=3
+    )
+    assert set(learning_curves) == {
+        f"alpha={alpha}, lambd=0.0" for alpha in (0.1, 0.3, 0.5, 0.7)
+    }
+    learned_episodes = [
+        np.count_nonzero(~np.isnan(curves[0]))
+        for curves in learning_curves.values()
+    ]
+    assert learned_episodes == [8, 4, 2, 2]
+    for curves in learning_curves.values():
+        assert np.array_equal(np.isnan(curves[0]), np.isnan(curves[1]))
+
+
+def test_successive_halving_ranks_configs_by_goal():
+    for goal in ('min', 'max'):
+        learning_curves = successive_halving(
+            classic.Q, FakeGridWithWallsEnvironment,
+            {'alpha': [0.1, 0.5, 0.9]}, params={'epsilon': 0.1},
+            n_episodes=6, n_repeats=2, min_episodes=2, eta=3, goal=goal,
+            n_workers=1, seed=0
+        )
+        scores = [np.median(np.mean(curves[:, :2], axis=1))
+                  for curves in learning_curves.values()]
+        best, pruned = scores[0], scores[1:]
+        if goal == 'min':
+            assert all(best <= score for score in pruned)
+        else:
+            assert all(best >= score for score in pruned)
+
+
+@pytest.mark.parametrize('params', [
+    {'goal': 'mean'},
+    {'eta': 1},
+    {'min_episodes': 0}
+])
+def test_successive_halving_wrong_params(params):
+    with pytest.raises(ValueError):
+        successive_halving(classic.Q, FakeGridWithWallsEnvironment,
+                           {'alpha': [0.1]}, **params)
@@ -118,3 +118,47 @@ def test_fuzzy_set_from_membership_function_ranges(
     assert len(fs.membership_functions) == n_membership_functions
     for mf, mftype in zip(fs.membership_functions, membership_functions_types):
         assert isinstance(mf, mftype)
+
+
+class TableMembershipFunction(MembershipFunction):
+
+    def membership_grade(self, x):
+        return 1.0 if x in (0.0, 1.0) else 0.0
+
+
+@pytest.mark.parametrize('membership_function_ranges', [
+    [(-inf, -inf, 1.0, 1.0), (1.0, 1.0, inf, inf)],
+    [(-inf, -inf, -1.03, -0.69), (-1.03, -0.69, -0.35), (-0.69, -0.35, -0.01),
+     (-0.35, -0.01, 0.33), (-0.01, 0.33, inf, inf)],
+    [(0.0, 0.0, 1.0), (0.0, 1.0, 1.0), (1.0, 1.0, 1.0, 1.0),
+     (0.0, 0.0, 1.0, 1.0), (-1.0, 0.0, 0.0, 2.0), (0.5, 1.0, 2.0),
+     (0.0, 0.0, 0.0)],
+    [(-inf, -inf, 0.0, 0.0), (0.0, 0.0, inf, inf)],
+    [(-1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (-1.0, -1.0, 0.0, 0.0)],
+    []
+])
+def test_fuzzy_set_membership_grades_match_membership_functions(
+        membership_function_ranges
+):
+    fs = FuzzySet.from_membership_functions_ranges(membership_function_ranges)
+    xs = [-2.0, -1.03, -0.69, -0.5, -0.35, -0.01, 0.0, 5e-324, -5e-324, 1e-200,
+          0.2, 0.33, 0.5, 1.0, 1.5, 2.0, 3.0] + \
+        [uniform(-3.0, 3.0) for i in range(50)]
+    batch_grades = fs.membership_grades(np.array(xs))
+    assert batch_grades.shape == (len(xs), len(membership_function_ranges))
+    for x, grades in zip(xs, batch_grades):
+        expected_grades = [
+            mf.membership_grade(x) for mf in fs.membership_functions
+        ]
+        assert list(fs.membership_grades(x)) == expected_grades
+        assert list(grades) == expected_grades
+
+
+def test_fuzzy_set_without_breakpoints_membership_grades():
+    fs = FuzzySet([TableMembershipFunction(),
+                   TriangularMembershipFunction(0.0, 1.0, 2.0)])
+    assert fs.breakpoints is None
+    assert list(fs.membership_grades(1.0)) == [1.0, 1.0]
+    assert fs.membership_grades(np.array([0.0, 0.5, 3.0])).tolist() == [
+        [1.0, 0.0], [0.0, 0.5], [0.0, 0.0]
+    ]
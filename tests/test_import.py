@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import rltoolbox
+
+
+@pytest.mark.parametrize('module', [
+    'rltoolbox.algorithm.classic',
+    'rltoolbox.algorithm.fuzzy',
+    'rltoolbox.environment.continuous',
+    'rltoolbox.experiment'
+])
+def test_import_does_not_load_matplotlib(module):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(rltoolbox.__file__))),
+        env.get('PYTHONPATH')
+    ]))
+    status = subprocess.call([
+        sys.executable, '-c',
+        f"import sys, {module}; " +
+        "sys.exit('matplotlib' in sys.modules)"
+    ], env=env)
+    assert status == 0
+
+
+def test_pyplot_forces_agg_backend_when_headless():
+    env = {k: v for k, v in os.environ.items()
+           if k not in ('DISPLAY', 'WAYLAND_DISPLAY', 'MPLBACKEND')}
+    env['PYTHONPATH'] = os.path.dirname(
+        os.path.dirname(os.path.abspath(rltoolbox.__file__))
+    )
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        "from rltoolbox.misc import pyplot; " +
+        "print(pyplot().get_backend())"
+    ], env=env, text=True)
+    if sys.platform.startswith('linux'):
+        assert output.strip().lower() == 'agg'
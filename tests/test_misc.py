@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from rltoolbox.misc import RandomStream
+
+
+def test_random_stream_is_reproducible():
+    streams = [RandomStream(4, seed=3, block_size=16) for i in range(2)]
+    for stream in streams:
+        stream.values = [stream.uniform() for i in range(40)] + \
+            [stream.action() for i in range(40)]
+    assert streams[0].values == streams[1].values
+
+
+def test_random_stream_values():
+    stream = RandomStream(3, seed=0, block_size=8)
+    uniforms = [stream.uniform() for i in range(1000)]
+    actions = [stream.action() for i in range(1000)]
+    assert all(0.0 <= u < 1.0 for u in uniforms)
+    assert set(actions) == {0, 1, 2}
+
+
+def test_random_stream_matches_generator_blocks():
+    stream = RandomStream(5, seed=1, block_size=4)
+    generator = np.random.default_rng(1)
+    expected = generator.random(4).tolist()[::-1] + \
+        generator.random(4).tolist()[::-1]
+    assert [stream.uniform() for i in range(8)] == expected
+
+
+@pytest.mark.parametrize('seq', [[7], [1, 2], (3, 4, 5), np.array([2, 0])])
+def test_random_stream_choice(seq):
+    stream = RandomStream(2, seed=0)
+    chosen = {stream.choice(seq) for i in range(200)}
+    assert chosen == set(seq)
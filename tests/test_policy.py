@@ -0,0 +1,113 @@
+import pickle
+import numpy as np
+import pytest
+
+from rltoolbox.algorithm import classic, cmac, fuzzy
+from rltoolbox.approximator import (
+    CMACApproximator,
+    FuzzyApproximator,
+    TableApproximator
+)
+from rltoolbox.environment.continuous import BallBeam
+from rltoolbox.policy import (
+    Policy,
+    export_grid_policy,
+    export_policy,
+    export_table_policy
+)
+from rltoolbox.tests.fakes import FakeGridWithWallsEnvironment
+
+
+def greedy(algorithm, environment_state):
+    return int(np.argmax(algorithm.action_values(environment_state)))
+
+
+def test_policy_cells():
+    policy = Policy([[0.0, 1.0], []], np.array([2, 1, 0]))
+    assert policy.table.dtype == np.int8
+    assert [policy((x, 5.0)) for x in (-1.0, 0.0, 0.5, 1.0, 3.0)] == \
+        [2, 1, 1, 0, 0]
+    assert list(policy.actions([(-1.0, 5.0), (0.5, 0.0), (2.0, 1.0)])) == \
+        [2, 1, 0]
+
+
+@pytest.mark.parametrize('edges,table', [
+    ([[0.0, 1.0]], np.array([0, 1])),
+    ([[0.0]], np.array([0, 200]))
+])
+def test_policy_wrong_table(edges, table):
+    with pytest.raises(ValueError):
+        Policy(edges, table)
+
+
+def test_policy_pickle():
+    policy = Policy([[0.0, 1.0], [2.0]], np.arange(6) % 3)
+    loaded = pickle.loads(pickle.dumps(policy))
+    assert np.array_equal(loaded.table, policy.table)
+    assert loaded((0.5, 3.0)) == policy((0.5, 3.0))
+
+
+def test_export_grid_environment_table_policy():
+    environment = FakeGridWithWallsEnvironment()
+    algorithm = classic.Q(environment, seed=0)
+    algorithm.learn(20, print_status=False)
+    policy = export_policy(algorithm)
+    for s in environment.states:
+        position = divmod(s, environment.grid.shape[1])
+        assert policy(position) == greedy(algorithm, s)
+
+
+@pytest.mark.parametrize('algorithm', [classic.SARSA, classic.AHC])
+def test_export_table_approximated_environment_policy(algorithm):
+    environment = BallBeam(max_steps=200)
+    environment.approximate_with(TableApproximator)
+    algorithm = algorithm(environment, seed=0)
+    algorithm.learn(5, print_status=False)
+    policy = export_table_policy(algorithm)
+    rng = np.random.default_rng(0)
+    observations = rng.uniform(-1.5, 1.5, (200, 2))
+    for observation in observations:
+        assert policy(observation) == greedy(
+            algorithm, environment.approximator.approximate_state(observation)
+        )
+    assert np.array_equal(policy.actions(observations),
+                          [policy(observation) for observation in observations])
+
+
+@pytest.mark.parametrize('algorithm,approximator', [
+    (cmac.CMACQ, CMACApproximator),
+    (fuzzy.FQ, FuzzyApproximator)
+])
+def test_export_grid_policy(algorithm, approximator):
+    environment = BallBeam(max_steps=200)
+    environment.approximate_with(approximator)
+    algorithm = algorithm(environment, seed=0)
+    algorithm.learn(5, print_status=False)
+    policy = export_policy(algorithm, resolution=8)
+    assert policy.table.shape == (8, 8)
+    centers = [(e[1:] + e[:-1]) / 2 for e in policy.edges]
+    for x in centers[0]:
+        for y in centers[1]:
+            assert policy((x, y)) == greedy(
+                algorithm, environment.approximator.approximate_state((x, y))
+            )
+
+
+def test_export_policy_wrong_algorithm():
+    environment = BallBeam()
+    environment.approximate_with(CMACApproximator)
+    with pytest.raises(TypeError):
+        export_table_policy(cmac.CMACQ(environment))
+    with pytest.raises(TypeError):
+        export_grid_policy(classic.Q(FakeGridWithWallsEnvironment()))
+
+
+@pytest.mark.parametrize('n_variables', [1, 2, 3, 4, 5, 6])
+def test_policy_lookup_for_any_number_of_variables(n_variables):
+    rng = np.random.default_rng(n_variables)
+    edges = [sorted(rng.uniform(-1.0, 1.0, i % 3)) for i in range(n_variables)]
+    shape = tuple(len(e) + 1 for e in edges)
+    policy = Policy(edges, rng.integers(4, size=int(np.prod(shape))))
+    observations = rng.uniform(-1.5, 1.5, (100, n_variables))
+    assert [policy(observation) for observation in observations] == \
+        list(policy.actions(observations))
@@ -0,0 +1,61 @@
+import pstats
+
+import pytest
+
+from rltoolbox.algorithm import classic, cmac, fuzzy
+from rltoolbox.profiling import PHASES, Profiler
+from rltoolbox.tests.fakes import (
+    FakeGridWithWallsEnvironment,
+    cmac_environment,
+    fuzzy_environment
+)
+
+
+@pytest.mark.parametrize('algorithm,environment,approximated', [
+    (classic.Q, FakeGridWithWallsEnvironment, False),
+    (classic.SARSA, FakeGridWithWallsEnvironment, False),
+    (cmac.CMACR, cmac_environment, True),
+    (fuzzy.FQ, fuzzy_environment, True)
+])
+def test_profiled_learning(algorithm, environment, approximated):
+    profiled = algorithm(environment(), seed=3)
+    profiler = Profiler()
+    profiled.learn(3, print_status=False, profiler=profiler)
+    unprofiled = algorithm(environment(), seed=3)
+    unprofiled.learn(3, print_status=False)
+    assert profiled.steps_per_episode == unprofiled.steps_per_episode
+    assert [r['episode'] for r in profiler.episodes] == [1, 2, 3]
+    for report, steps in zip(profiler.episodes, profiled.steps_per_episode):
+        assert report['steps'] == steps
+        assert report['calls']['environment'] == steps
+        assert report['calls']['other'] == steps
+        assert report['calls']['approximation'] == \
+            (steps if approximated else 0)
+        assert 0 < report['calls']['selection'] <= steps + 1
+        assert report['calls']['render'] == 0
+        assert all(report['times'][phase] >= 0.0 for phase in PHASES)
+        assert sum(report['times'].values()) == \
+            pytest.approx(report['total'])
+    # wrappers are removed after episodes
+    assert 'greedy_action' not in vars(profiled)
+    assert 'step' not in vars(profiled.environment)
+    summary = profiler.summary()
+    assert summary['calls']['environment'] == sum(profiled.steps_per_episode)
+
+
+def test_profile_stats_windows(tmp_path):
+    path = str(tmp_path / 'stats')
+    profiler = Profiler(stats_path=path, stats_every=2)
+    algorithm = classic.Q(FakeGridWithWallsEnvironment(), seed=0)
+    algorithm.learn(3, print_status=False, profiler=profiler)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['stats.1-2.prof']
+    profiler.dump_stats()
+    assert (tmp_path / 'stats.3-3.prof').exists()
+    stats = pstats.Stats(str(tmp_path / 'stats.1-2.prof'))
+    assert any(name == 'run_learning_episode'
+               for filename, line, name in stats.stats)
+
+
+def test_invalid_stats_window():
+    with pytest.raises(ValueError):
+        Profiler(stats_every=0)
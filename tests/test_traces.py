@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from rltoolbox.algorithm import classic
+from rltoolbox.tests.fakes import FakeGridNoWallsEnvironment
+from rltoolbox.traces import (
+    EligibilityTraces,
+    SparseEligibilityTraces,
+    create_eligibility_traces
+)
+
+
+@pytest.mark.parametrize('cutoff,expected_type', [
+    (None, EligibilityTraces),
+    (0.0, SparseEligibilityTraces),
+    (0.01, SparseEligibilityTraces)
+])
+def test_create_eligibility_traces(cutoff, expected_type):
+    traces = create_eligibility_traces((3, 2), cutoff)
+    assert type(traces) is expected_type
+
+
+def test_create_eligibility_traces_negative_cutoff():
+    with pytest.raises(ValueError):
+        create_eligibility_traces((3, 2), -0.1)
+
+
+@pytest.mark.parametrize('shape,indices', [
+    ((5,), [0, 3, 3, 4, 0, 1]),
+    ((4, 3), [(0, 1), (2, 2), (0, 1), (3, 0), (2, 2)])
+])
+def test_sparse_traces_match_dense_traces(shape, indices):
+    dense = EligibilityTraces(shape)
+    sparse = SparseEligibilityTraces(shape, 0.0)
+    dense_table, sparse_table = np.zeros(shape), np.zeros(shape)
+    for i, index in enumerate(indices):
+        dense.visit(index)
+        sparse.visit(index)
+        dense.update(dense_table, 0.1 * i)
+        sparse.update(sparse_table, 0.1 * i)
+        dense.decay(0.5)
+        sparse.decay(0.5)
+        assert np.allclose(dense.e, sparse.e)
+    assert np.allclose(dense_table, sparse_table)
+
+
+def test_sparse_traces_visit_many():
+    sparse = SparseEligibilityTraces((2, 3), 0.0)
+    sparse.visit(4)
+    sparse.visit(np.array([1, 4]), np.array([0.5, 0.25]))
+    assert np.array_equal(sparse.e, [[0.0, 0.5, 0.0], [0.0, 1.25, 0.0]])
+
+
+def test_sparse_traces_drop_entries_below_cutoff():
+    sparse = SparseEligibilityTraces((10,), 0.2)
+    table = np.zeros(10)
+    sparse.visit(1)
+    sparse.decay(0.5)
+    sparse.visit(2)
+    sparse.update(table, 1.0)
+    assert sorted(sparse.traces) == [1, 2]
+    sparse.decay(0.5)
+    # trace of entry 1 (0.25) is above cutoff, but not after next decay
+    sparse.decay(0.5)
+    assert np.array_equal(sparse.e, [0.0, 0.0, 0.25] + [0.0] * 7)
+    # update applies only traces shown in e and drops the others
+    expected = table + 2.0 * sparse.e
+    sparse.update(table, 2.0)
+    assert np.array_equal(table, expected)
+    assert list(sparse.traces) == [2]
+
+
+@pytest.mark.parametrize('cutoff', [0.0, 0.01])
+def test_sparse_traces_switch_to_dense_array_and_back(cutoff):
+    shape = (128, 4)
+    dense = EligibilityTraces(shape)
+    sparse = SparseEligibilityTraces(shape, cutoff)
+    assert sparse.max_active == 16
+    dense_table, sparse_table = np.zeros(shape), np.zeros(shape)
+    rng = np.random.default_rng(0)
+    modes = set()
+    for i in range(4000):
+        # wide exploration first, then few entries, until traces of others
+        # are below cutoff (or underflow to zero)
+        index = (int(rng.integers(128 if i < 100 else 2)),
+                 int(rng.integers(4)))
+        dense.visit(index)
+        sparse.visit(index)
+        dense.update(dense_table, 0.1)
+        sparse.update(sparse_table, 0.1)
+        dense.decay(0.8)
+        sparse.decay(0.8)
+        modes.add(sparse.dense is None)
+    assert modes == {True, False}
+    assert sparse.dense is None
+    assert np.allclose(dense_table, sparse_table, rtol=cutoff + 1e-9,
+                       atol=cutoff)
+
+
+def test_sparse_traces_decay_rescaling():
+    sparse = SparseEligibilityTraces((3,), 0.0)
+    sparse.visit(0)
+    for i in range(300):
+        sparse.decay(0.5)
+        sparse.visit(1)
+    assert sparse.scale >= sparse.min_scale
+    assert np.allclose(sparse.e, [0.0, 2.0, 0.0])
+
+
+@pytest.mark.parametrize('algorithm', [
+    classic.Q,
+    classic.SARSA,
+    classic.R,
+    classic.AHC
+])
+def test_sparse_traces_learning_equals_dense_traces_learning(algorithm):
+    tables = []
+    for trace_cutoff in (None, 0.0):
+        alg = algorithm(FakeGridNoWallsEnvironment(), lambd=0.5,
+                        trace_cutoff=trace_cutoff, seed=7)
+        alg.learn(3, print_status=False)
+        tables.append(alg.mi if algorithm is classic.AHC else alg.Q)
+    assert np.allclose(tables[0], tables[1])
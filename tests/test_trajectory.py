@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from rltoolbox.tests.fakes import FakeContinuousEnvironment
+from rltoolbox.trajectory import (
+    FullTrajectory,
+    RingTrajectory,
+    StepCounter,
+    create_trajectory
+)
+
+
+@pytest.mark.parametrize('recording,size,expected_type', [
+    ('count', None, StepCounter),
+    ('ring', 3, RingTrajectory),
+    ('full', None, FullTrajectory),
+    ('full', 2, FullTrajectory)
+])
+def test_create_trajectory(recording, size, expected_type):
+    assert type(create_trajectory(recording, 2, size)) is expected_type
+
+
+@pytest.mark.parametrize('recording,size', [
+    ('all', None),
+    ('ring', None),
+    ('ring', 0)
+])
+def test_create_trajectory_wrong_params(recording, size):
+    with pytest.raises(ValueError):
+        create_trajectory(recording, 2, size)
+
+
+def test_step_counter():
+    trajectory = StepCounter(2)
+    for i in range(5):
+        trajectory.record((i, i))
+    assert trajectory.n_steps == 5
+    assert trajectory.observations.shape == (0, 2)
+    trajectory.clear()
+    assert trajectory.n_steps == 0
+
+
+@pytest.mark.parametrize('n_steps,expected', [
+    (2, [[0.0, 0.0], [1.0, -1.0]]),
+    (3, [[0.0, 0.0], [1.0, -1.0], [2.0, -2.0]]),
+    (7, [[4.0, -4.0], [5.0, -5.0], [6.0, -6.0]])
+])
+def test_ring_trajectory_keeps_last_observations(n_steps, expected):
+    trajectory = RingTrajectory(2, 3)
+    for i in range(n_steps):
+        trajectory.record((i, -i))
+    assert trajectory.n_steps == n_steps
+    assert np.array_equal(trajectory.observations, expected)
+
+
+def test_full_trajectory_grows():
+    trajectory = FullTrajectory(2, 2)
+    for i in range(9):
+        trajectory.record((i, -i))
+    assert trajectory.n_steps == 9
+    assert np.array_equal(trajectory.observations,
+                          [[i, -i] for i in range(9)])
+    trajectory.clear()
+    assert len(trajectory.observations) == 0
+
+
+@pytest.mark.parametrize('recording,recording_size,expected_length', [
+    ('count', None, 0),
+    ('ring', 2, 2),
+    ('full', None, 4)
+])
+def test_environment_recording(recording, recording_size, expected_length):
+    env = FakeContinuousEnvironment(recording=recording,
+                                    recording_size=recording_size)
+    observations = []
+    for i in range(4):
+        env.do_action(2)
+        observations.append(env.model.observation)
+    assert env.steps == 4
+    assert np.array_equal(
+        env.trajectory.observations,
+        np.array(observations)[len(observations) - expected_length:]
+    )
+    env.clear()
+    assert env.steps == 0
@@ -0,0 +1,161 @@
+import numpy as np
+
+
+class EligibilityTraces:
+    """EligibilityTraces - accumulating eligibility traces kept for every
+        entry of learned table."""
+
+    def __init__(self, shape):
+        self.e = np.zeros(shape)
+
+    def visit(self, index, value=1.0):
+        self.e[index] += value
+
+    def update(self, table, step: float):
+        table += step * self.e
+
+    def decay(self, factor: float):
+        self.e *= factor
+
+
+class SparseEligibilityTraces(EligibilityTraces):
+    """SparseEligibilityTraces - accumulating eligibility traces kept only
+        for active set of recently visited entries, which traces are above
+        cutoff value. Traces are kept in dict of flat indices and share one
+        lazily applied scale factor, so decaying costs O(1) and visiting and
+        updating table cost proportionally to size of active set - they are
+        written as Python loops, which for few entries are much faster than
+        numpy calls. Entries which traces aren't above cutoff are dropped
+        while table is updated, so they are neither applied nor shown in e.
+        If active set grows above max_active entries (by default 1/32 of
+        table size, from 8 to 64), e.g. with zero cutoff, traces are kept in
+        dense array like in EligibilityTraces (all of them are applied and
+        shown in e), until active set shrinks to half of max_active."""
+    min_scale = 1e-100
+    # decays of dense traces between checks of active set size
+    check_every = 64
+
+    def __init__(self, shape, cutoff: float = 0.0, max_active: int = None):
+        self.shape = tuple(np.atleast_1d(shape))
+        self.strides = tuple(
+            int(np.prod(self.shape[i + 1:])) for i in range(len(self.shape))
+        )
+        self.cutoff = cutoff
+        # subnormal traces aren't decayed to zero by multiplication, so they
+        # are dropped also with zero cutoff
+        self.threshold = max(cutoff, np.finfo(float).tiny)
+        self.max_active = max_active if max_active is not None else \
+            min(max(int(np.prod(self.shape)) // 32, 8), 64)
+        self.traces = {}
+        self.scale = 1.0
+        self.dense = None
+        self._decays = 0
+        self._table = None
+
+    @property
+    def e(self):
+        if self.dense is not None:
+            return self.dense.copy()
+        e = np.zeros(self.shape)
+        flat = e.reshape(-1)
+        for index, trace in self.traces.items():
+            trace *= self.scale
+            if abs(trace) > self.threshold:
+                flat[index] = trace
+        return e
+
+    def flat_index(self, index):
+        if isinstance(index, tuple):
+            if len(index) == 2:
+                return index[0] * self.strides[0] + index[1]
+            flat = 0
+            for i, stride in zip(index, self.strides):
+                flat += i * stride
+            return flat
+        return index
+
+    def visit(self, index, value=1.0):
+        """Accumulates trace of entry (or of array of unique entries, given
+            with flat indices or tuple of indices arrays)."""
+        if self.dense is not None:
+            if isinstance(index, tuple):
+                self.dense[index] += value
+            else:
+                self._dense_flat[index] += value
+            return
+        index = self.flat_index(index)
+        traces = self.traces
+        if isinstance(index, np.ndarray):
+            if isinstance(value, np.ndarray):
+                values = (value / self.scale).tolist()
+            else:
+                values = [value / self.scale] * index.size
+            for i, v in zip(index.tolist(), values):
+                traces[i] = traces.get(i, 0.0) + v
+        else:
+            traces[index] = traces.get(index, 0.0) + value / self.scale
+        if len(traces) > self.max_active:
+            self.densify()
+
+    def update(self, table, step: float):
+        if self.dense is not None:
+            table += step * self.dense
+            return
+        if table is not self._table:
+            self._table = table
+            # memoryview items are read and written faster than numpy ones
+            self._flat = memoryview(table.reshape(-1)) \
+                if table.flags.c_contiguous and table.dtype == np.float64 \
+                else table.flat
+        flat = self._flat
+        step *= self.scale
+        threshold = self.threshold / self.scale
+        dropped = []
+        for index, trace in self.traces.items():
+            if trace > threshold or trace < -threshold:
+                flat[index] += step * trace
+            else:
+                dropped.append(index)
+        for index in dropped:
+            del self.traces[index]
+
+    def decay(self, factor: float):
+        if self.dense is not None:
+            self.dense *= factor
+            self._decays += 1
+            if self._decays % self.check_every == 0:
+                self.sparsify()
+            return
+        self.scale *= factor
+        if self.scale < self.min_scale:
+            scale = self.scale
+            self.traces = {
+                index: trace * scale for index, trace in self.traces.items()
+            }
+            self.scale = 1.0
+
+    def densify(self):
+        """Moves traces of active set into dense array."""
+        self.dense = np.zeros(self.shape)
+        self._dense_flat = self.dense.reshape(-1)
+        for index, trace in self.traces.items():
+            self._dense_flat[index] = trace * self.scale
+        self.traces = {}
+        self.scale = 1.0
+
+    def sparsify(self):
+        """Moves traces above cutoff from dense array back to active set, if
+            there are at most half of max_active of them."""
+        active = np.flatnonzero(np.abs(self._dense_flat) > self.threshold)
+        if active.size <= self.max_active // 2:
+            self.traces = dict(zip(active.tolist(),
+                                   self._dense_flat[active].tolist()))
+            self.dense = None
+
+
+def create_eligibility_traces(shape, cutoff: float = None):
+    if cutoff is None:
+        return EligibilityTraces(shape)
+    if cutoff < 0.0:
+        raise ValueError("traces cutoff must be non-negative")
+    return SparseEligibilityTraces(shape, cutoff)
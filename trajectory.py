@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class StepCounter:
+    """StepCounter - trajectory recorder which only counts steps of episode,
+        no observations are kept."""
+
+    def __init__(self, n_variables: int, *args, **kwargs):
+        self.n_variables = n_variables
+        self.clear()
+
+    @property
+    def observations(self) -> np.ndarray:
+        return np.empty((0, self.n_variables))
+
+    def clear(self):
+        self.n_steps = 0
+
+    def record(self, observation):
+        self.n_steps += 1
+
+
+class RingTrajectory(StepCounter):
+    """RingTrajectory - trajectory recorder keeping last size observations
+        of episode in preallocated ring buffer."""
+
+    def __init__(self, n_variables: int, size: int, *args, **kwargs):
+        if size is None or size <= 0:
+            raise ValueError("size of ring trajectory must be positive")
+        self.buffer = np.empty((size, n_variables))
+        super().__init__(n_variables)
+
+    @property
+    def observations(self) -> np.ndarray:
+        """Returns copy of kept observations, oldest first."""
+        size = len(self.buffer)
+        if self.n_steps <= size:
+            return self.buffer[:self.n_steps].copy()
+        return np.roll(self.buffer, -(self.n_steps % size), axis=0)
+
+    def record(self, observation):
+        self.buffer[self.n_steps % len(self.buffer)] = observation
+        self.n_steps += 1
+
+
+class FullTrajectory(StepCounter):
+    """FullTrajectory - trajectory recorder keeping all observations of
+        episode in growable array, which capacity is doubled when full."""
+
+    def __init__(self, n_variables: int, capacity: int = None,
+                 *args, **kwargs):
+        self.buffer = np.empty((capacity or 1024, n_variables))
+        super().__init__(n_variables)
+
+    @property
+    def observations(self) -> np.ndarray:
+        """Returns view of recorded observations, valid until next record
+            or clear."""
+        return self.buffer[:self.n_steps]
+
+    def record(self, observation):
+        if self.n_steps == len(self.buffer):
+            buffer = np.empty((2 * len(self.buffer), self.n_variables))
+            buffer[:self.n_steps] = self.buffer
+            self.buffer = buffer
+        self.buffer[self.n_steps] = observation
+        self.n_steps += 1
+
+
+recorders = {
+    'count': StepCounter,
+    'ring': RingTrajectory,
+    'full': FullTrajectory
+}
+
+
+def create_trajectory(recording: str, n_variables: int, size: int = None):
+    """Returns trajectory recorder for given recording mode: 'count' (steps
+        counter), 'ring' (last size observations) or 'full' (all of
+        observations, size being initial capacity)."""
+    if recording not in recorders:
+        raise ValueError(f"recording must be one of {list(recorders)}," +
+                         f" given {recording!r}")
+    return recorders[recording](n_variables, size)